@@ -11,6 +11,7 @@ const {
   createIndexData, 
   getUserWithStocks, 
   getMarketData, 
+  getLatestMarketData, 
   getIndexData, 
   getUserByKakaoId 
 } = require('./dynamo/db');
@@ -85,22 +86,26 @@ app.get('/stocks/marketdata', async (req, res) => {
     console.log('사용자별 Stocks MarketData 요청:', req.requestContext.authorizer.principalId);
     const items = await getUserWithStocks(req.requestContext.authorizer.principalId);
     const stocks = items.filter(item => item.SK.startsWith('STOCK#'));
+    // 크롤러가 만든 관심 종목 스냅샷이 현재 보유 종목과 같으면 추가 조회 없이 그대로 반환
+    const snapshot = items.find(item => item.SK === 'WATCHLIST_SNAPSHOT');
+    const symbols = stocks.map(stock => stock.symbol).sort();
+    if (snapshot && JSON.stringify([...snapshot.symbols].sort()) === JSON.stringify(symbols)) {
+      console.log('Stocks MarketData 스냅샷 사용:', snapshot.holdings.length, '개 주식');
+      return res.status(200).json(snapshot.holdings);
+    }
     const result = [];
     for (const stock of stocks) {
-      const marketData = await getMarketData(stock.symbol, new Date().toISOString().split('T')[0]);
+      const latest = await getLatestMarketData(stock.symbol);
       result.push({
         symbol: stock.symbol,
         name: stock.name,
         userId: stock.userId,
-        marketData: marketData[0] ? {
-          price: parseInt(marketData[0].price),
-          change: parseInt(marketData[0].change),
-          changeRate: parseFloat(marketData[0].changeRate),
-          date: marketData[0].date,
-          foreignerNetBuy: marketData[0].foreignerNetBuy.map((netBuy, i) => ({
-            date: marketData[0].foreignerNetBuyDate[i],
-            net_buy: parseInt(netBuy)
-          })).filter(item => item.date)
+        marketData: latest ? {
+          price: parseInt(latest.price),
+          change: parseInt(latest.change),
+          changeRate: parseFloat(latest.changeRate),
+          date: latest.date,
+          foreignerNetBuy: latest.foreignerNetBuy
         } : null
       });
     }
@@ -161,19 +166,16 @@ app.post('/stock/add', async (req, res) => {
 app.get('/stock/:symbol/foreign', async (req, res) => {
   const { symbol } = req.params;
   try {
-    const marketData = await getMarketData(symbol, new Date().toISOString().split('T')[0]);
-    if (marketData[0]) {
+    const latest = await getLatestMarketData(symbol);
+    if (latest) {
       res.json({
-        symbol: marketData[0].symbol,
-        date: marketData[0].date,
-        price: parseInt(marketData[0].price),
-        change: parseInt(marketData[0].change),
-        changeRate: parseFloat(marketData[0].changeRate),
-        stockName: marketData[0].stockName,
-        foreignerNetBuy: marketData[0].foreignerNetBuy.map((netBuy, i) => ({
-          date: marketData[0].foreignerNetBuyDate[i],
-          net_buy: parseInt(netBuy)
-        })).filter(item => item.date)
+        symbol: latest.symbol,
+        date: latest.date,
+        price: parseInt(latest.price),
+        change: parseInt(latest.change),
+        changeRate: parseFloat(latest.changeRate),
+        stockName: latest.stockName,
+        foreignerNetBuy: latest.foreignerNetBuy
       });
     } else {
       res.status(404).json({ message: 'Market data not found for this symbol.' });
@@ -132,6 +132,43 @@ async function getUserWithStocks(userId) {
   }
 }
 
+function decodeForeignerFlow(buffer) {
+  // 크롤러 MARKETDATA_COMPACT 형식(crawler/flow_codec.py) 복원: varint/zigzag, 기준일 + 일수 차
+  let pos = 1;
+  const readVarint = () => {
+    let result = 0;
+    let scale = 1;
+    for (;;) {
+      const byte = buffer[pos++];
+      result += (byte & 0x7f) * scale;
+      if (!(byte & 0x80)) return result;
+      scale *= 128;
+    }
+  };
+  const unzigzag = (value) => (value % 2 === 0 ? value / 2 : -(value + 1) / 2);
+  if (buffer[0] !== 1) throw new Error(`지원하지 않는 foreignerFlow 형식: ${buffer[0]}`);
+  const count = readVarint();
+  const bitmap = readVarint();
+  const dates = new Array(count).fill('');
+  let previous = null;
+  for (let i = 0; i < count; i++) {
+    if (Math.floor(bitmap / 2 ** i) % 2 === 0) continue;
+    const value = readVarint();
+    previous = previous === null ? value : previous - unzigzag(value);
+    dates[i] = new Date(previous * 86400000).toISOString().split('T')[0];
+  }
+  const netBuys = [];
+  for (let i = 0; i < count; i++) netBuys.push(unzigzag(readVarint()));
+  return { foreignerNetBuy: netBuys, foreignerNetBuyDate: dates };
+}
+
+function decodeMarketData(item) {
+  // 압축 저장된 foreignerFlow(Binary)를 foreignerNetBuy/foreignerNetBuyDate List 형태로 변환
+  if (!item || !item.foreignerFlow) return item;
+  const { foreignerFlow, ...rest } = item;
+  return { ...rest, ...decodeForeignerFlow(Buffer.from(foreignerFlow)) };
+}
+
 async function getMarketData(symbol, date) {
   // MarketData 조회: 특정 symbol과 date로 조회
   const params = {
@@ -145,13 +182,29 @@ async function getMarketData(symbol, date) {
   try {
     const result = await dynamoDb.query(params).promise();
     console.log(`MarketData 조회 성공: ${symbol}_${date}`);
-    return result.Items; // foreignerNetBuy/Date는 List로 반환
+    return result.Items.map(decodeMarketData); // foreignerNetBuy/Date는 List로 반환
   } catch (error) {
     console.error('MarketData 조회 오류:', error);
     throw error;
   }
 }
 
+async function getLatestMarketData(symbol) {
+  // 크롤러가 유지하는 종목별 최신 시세(STOCK#<symbol> / LATEST) 조회: 응답 형태 그대로 저장됨
+  const params = {
+    TableName: process.env.DYNAMODB_TABLE || 'fiflow-users',
+    Key: { PK: `STOCK#${symbol}`, SK: 'LATEST' },
+    ConsistentRead: true
+  };
+  try {
+    const result = await dynamoDb.get(params).promise();
+    return result.Item || null;
+  } catch (error) {
+    console.error('최신 MarketData 조회 오류:', error);
+    throw error;
+  }
+}
+
 async function getIndexData(name, date) {
   // IndexData 조회: 특정 name과 date로 조회
   const params = {
@@ -176,7 +229,7 @@ async function getUserByEmail(email) {
   // GSI를 사용해 email로 User 조회
   const params = {
     TableName: process.env.DYNAMODB_TABLE || 'fiflow-users',
-    IndexName: 'email-index',
+    IndexName: process.env.EMAIL_INDEX || 'email-index', // INCLUDE 프로젝션 인덱스로 이전 시 환경 변수로 지정
     KeyConditionExpression: 'email = :email',
     ExpressionAttributeValues: {
       ':email': email
@@ -196,7 +249,7 @@ async function getUserByKakaoId(kakaoId) {
   // GSI를 사용해 kakaoId로 User 조회
   const params = {
     TableName: process.env.DYNAMODB_TABLE || 'fiflow-users',
-    IndexName: 'kakaoId-index',
+    IndexName: process.env.KAKAO_ID_INDEX || 'kakaoId-index',
     KeyConditionExpression: 'kakaoId = :kakaoId',
     ExpressionAttributeValues: {
       ':kakaoId': kakaoId
@@ -220,6 +273,7 @@ module.exports = {
   createIndexData,
   getUserWithStocks,
   getMarketData,
+  getLatestMarketData,
   getIndexData,
   getUserByEmail,
   getUserByKakaoId
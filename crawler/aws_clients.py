@@ -0,0 +1,80 @@
+# crawler/aws_clients.py
+import os
+import threading
+from crawl_engine import MAX_IN_FLIGHT, MAX_PER_HOST
+import model_cache
+
+# 모든 크롤러 모듈이 공유하는 boto3 세션/클라이언트 (워밍된 Lambda 호출 간 재사용)
+# boto3 import와 서비스 모델 로딩은 첫 사용 시점까지 미룬다.
+AWS_REGION = os.environ.get('AWS_REGION', 'ap-northeast-2')
+
+# 커넥션 풀: 크롤링 동시 처리 수만큼 (심볼 작업 스레드마다 BatchWriter/BatchGet 호출이 겹칠 수 있음)
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', str(max(MAX_IN_FLIGHT, MAX_PER_HOST, 10))))
+AWS_CONNECT_TIMEOUT = float(os.environ.get('AWS_CONNECT_TIMEOUT', '2'))
+AWS_READ_TIMEOUT = float(os.environ.get('AWS_READ_TIMEOUT', '10'))
+# adaptive 모드: 스로틀링 응답에 맞춰 클라이언트 측 전송 속도를 조절 (BatchWriter 재시도와 별개, 시도 횟수는 첫 요청 포함)
+AWS_RETRY_MODE = os.environ.get('AWS_RETRY_MODE', 'adaptive')
+AWS_MAX_ATTEMPTS = int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '3'))
+
+_session = None
+_clients = {}
+_resources = {}
+_lock = threading.RLock()
+
+def get_config():
+    """튜닝된 botocore Config"""
+    from botocore.config import Config
+    return Config(
+        region_name=AWS_REGION,
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connect_timeout=AWS_CONNECT_TIMEOUT,
+        read_timeout=AWS_READ_TIMEOUT,
+        retries={'mode': AWS_RETRY_MODE, 'total_max_attempts': AWS_MAX_ATTEMPTS},
+    )
+
+def get_session():
+    """모듈 전역 boto3 세션 (자격 증명/모델 로더를 한 번만 초기화)
+
+    빌드된 모델 캐시(model_cache.py)가 있으면 캐시를 채운 로더를 등록해 서비스 모델 JSON 파싱을 건너뛴다.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import boto3
+                import botocore.session
+                core = botocore.session.get_session()
+                loader = model_cache.create_loader(core.get_config_variable('data_path'))
+                if loader is not None:
+                    core.register_component('data_loader', loader)
+                _session = boto3.session.Session(botocore_session=core, region_name=AWS_REGION)
+    return _session
+
+def get_resource(service='dynamodb'):
+    """서비스 리소스 (서비스당 1개)
+
+    리소스의 meta.client에는 boto3 고수준 변환(dynamodb: 파이썬 값 ↔ AttributeValue 자동 변환)이 걸려 있으므로
+    저수준 형식으로 요청할 때는 get_client()를 사용한다.
+    """
+    resource = _resources.get(service)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service)
+            if resource is None:
+                resource = _resources[service] = get_session().resource(service, config=get_config())
+    return resource
+
+def get_client(service='dynamodb'):
+    """저수준 클라이언트 (서비스당 1개, 스레드 간 공유 가능)
+
+    리소스 변환 훅이 없는 별도 클라이언트라 요청/응답 값은 AttributeValue 형식({'S': ...})이다.
+    같은 세션과 Config로 만들므로 커넥션 풀 설정/재시도 정책은 리소스와 같다.
+    """
+    client = _clients.get(service)
+    if client is None:
+        with _lock:
+            client = _clients.get(service)
+            if client is None:
+                client = _clients[service] = get_session().client(service, config=get_config())
+    return client
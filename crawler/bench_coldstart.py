@@ -0,0 +1,50 @@
+# crawler/bench_coldstart.py
+"""핸들러별 콜드 스타트 import 시간 측정
+
+각 핸들러 모듈을 새 파이썬 프로세스에서 `python -X importtime`으로 import하여
+누적 import 시간(중앙값)과 함께 로드된 무거운 패키지(boto3, botocore, bs4 등)를 보고한다.
+
+사용법: python bench_coldstart.py [반복 횟수] [모듈 ...]
+"""
+import os
+import sys
+import statistics
+import subprocess
+
+HANDLERS = ['get_realtime_price', 'index_crawler', 'lambda_main', 'get_stock_info']
+HEAVY_PACKAGES = ['requests', 'boto3', 'botocore', 'bs4', 'lxml']
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def measure(module):
+    """모듈 1회 import 시 (누적 import 시간 us, 패키지별 누적 시간 us) 반환"""
+    code = f"import sys; sys.path.append('python_libs'); import {module}"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=CRAWLER_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+    total = 0
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        if name == module:
+            total = int(cumulative)
+        if name in HEAVY_PACKAGES:
+            packages[name] = int(cumulative)
+    return total, packages
+
+def main(argv):
+    runs = int(argv[0]) if argv else 5
+    modules = argv[1:] or HANDLERS
+    print(f"{'handler':<22}{'median ms':>11}{'min ms':>9}  loaded packages (cumulative ms)")
+    for module in modules:
+        samples = [measure(module) for _ in range(runs)]
+        totals = [total for total, _ in samples]
+        packages = samples[-1][1]
+        loaded = ', '.join(f"{name}={packages[name] / 1000:.0f}" for name in HEAVY_PACKAGES if name in packages) or '-'
+        print(f"{module:<22}{statistics.median(totals) / 1000:>11.1f}{min(totals) / 1000:>9.1f}  {loaded}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
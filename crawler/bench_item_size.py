@@ -0,0 +1,76 @@
+# crawler/bench_item_size.py
+"""MarketData 항목 크기 / 쓰기·읽기 용량 비교 (List 배열 vs foreignerFlow 압축 바이너리)
+
+같은 데이터를 두 형식으로 만들어 복원 결과가 같은지 확인한 뒤
+항목 크기, PutItem WCU(기본 테이블 + 복제되는 GSI), 하루치 조회 RCU, 월간 저장량을 비교한다.
+
+사용법: python bench_item_size.py [종목 수] [하루 실행 횟수]
+"""
+import os
+import sys
+import random
+import datetime
+sys.path.append(os.path.join(os.path.dirname(__file__), 'python_libs'))
+
+import db
+import item_size
+
+def sample_market_data(symbol, date, rng):
+    days = []
+    day = date
+    while len(days) < 8:
+        day -= datetime.timedelta(days=1)
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+    return {
+        'symbol': symbol,
+        'date': date.isoformat(),
+        'price': rng.randint(1000, 900000),
+        'change': rng.randint(-20000, 20000),
+        'changeRate': round(rng.uniform(-30, 30), 2),
+        'stockName': rng.choice(['삼성전자', 'SK하이닉스', 'LG에너지솔루션', '카카오', 'NAVER']),
+        'foreignerNetBuy': [rng.randint(-5_000_000, 5_000_000) for _ in range(8)],
+        'foreignerNetBuyDate': days,
+    }
+
+def build(data, compact):
+    db.MARKETDATA_COMPACT = compact
+    return db._with_fingerprint(db.build_market_data_item(dict(data)))
+
+def main(argv):
+    symbols = int(argv[0]) if argv else 500
+    runs_per_day = int(argv[1]) if len(argv) > 1 else 24
+    rng = random.Random(0)
+    today = datetime.date.today()
+    samples = [sample_market_data(f'{i:06d}', today, rng) for i in range(symbols)]
+
+    rows = {}
+    for label, compact in (('list', False), ('compact', True)):
+        items = [build(data, compact) for data in samples]
+        for data, item in zip(samples, items):
+            decoded = db.decode_market_data_item(dict(item))
+            assert decoded['foreignerNetBuy'] == data['foreignerNetBuy'], data['symbol']
+            assert decoded['foreignerNetBuyDate'] == data['foreignerNetBuyDate'], data['symbol']
+        sizes = [item_size.item_size(item) for item in items]
+        rows[label] = {
+            'avg bytes': sum(sizes) / len(sizes),
+            'max bytes': max(sizes),
+            'WCU/put (base)': sum(item_size.write_units(item) for item in items) / len(items),
+            'WCU/put (+GSI)': sum(item_size.total_write_units(item) for item in items) / len(items),
+            'WCU/day': sum(item_size.total_write_units(item) for item in items) * runs_per_day,
+            # 심볼별 당일 항목 하나씩 조회 (GetItem/Query, 최종 일관성)
+            'RCU/day read': sum(item_size.read_units(size) for size in sizes),
+            # 전 종목 하루치를 한 번에 조회했다고 가정한 4KB 묶음 기준
+            'RCU bulk read': item_size.read_units(sum(sizes)),
+            'MB/month (+GSI)': sum(sizes) * 2 * 30 / 1024 / 1024,
+        }
+    db.MARKETDATA_COMPACT = False
+
+    print(f"symbols={symbols}, runs/day={runs_per_day}, GSI replicas={item_size.replicated_indexes(build(samples[0], False))}")
+    print(f"{'metric':<18}{'list':>12}{'compact':>12}{'ratio':>8}")
+    for metric in rows['list']:
+        before, after = rows['list'][metric], rows['compact'][metric]
+        print(f"{metric:<18}{before:>12.2f}{after:>12.2f}{after / before if before else 0:>8.2f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,74 @@
+# crawler/bench_model_cache.py
+"""botocore 모델 캐시(model_cache.py) 콜드 스타트 측정
+
+새 파이썬 프로세스마다 BOTOCORE_MODEL_CACHE=0/1로 db.py 경로를 실행하며 구간별 시간을 잰다.
+
+  import  import db (boto3/botocore는 첫 사용까지 import하지 않음)
+  first   첫 db.get_market_data 호출: boto3 import + 세션/리소스 생성(모델 로딩) + 요청 직렬화
+          DynamoDB 응답은 Stubber로 대신해 네트워크 시간은 포함하지 않음
+  second  두 번째 호출 (워밍 상태 기준선)
+
+먼저 python model_cache.py로 캐시 파일을 만들어야 한다.
+
+사용법: python bench_model_cache.py [반복 횟수]
+"""
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 자식 프로세스에서 실행할 코드: 구간별 ms를 JSON으로 출력
+CHILD = """
+import sys, time, json
+sys.path.append('python_libs')
+t0 = time.perf_counter()
+import db
+t1 = time.perf_counter()
+import aws_clients
+from botocore.stub import Stubber
+aws_clients.get_session()
+t_session = time.perf_counter()
+client = db.get_resource().meta.client
+t_resource = time.perf_counter()
+stubber = Stubber(client)
+for _ in range(2):
+    stubber.add_response('get_item', {'Item': {'PK': {'S': 'STOCK#005930'}, 'SK': {'S': 'MARKETDATA#2025-01-02'}}})
+stubber.activate()
+db.get_market_data('005930', '2025-01-02')
+t2 = time.perf_counter()
+db.get_market_data('005930', '2025-01-02')
+t3 = time.perf_counter()
+print(json.dumps({'import': (t1 - t0) * 1000, 'session': (t_session - t1) * 1000,
+                  'resource': (t_resource - t_session) * 1000, 'first': (t2 - t1) * 1000, 'second': (t3 - t2) * 1000}))
+"""
+PHASES = ['import', 'session', 'resource', 'first', 'second']
+
+def measure(enabled):
+    env = dict(os.environ, BOTOCORE_MODEL_CACHE='1' if enabled else '0',
+               AWS_ACCESS_KEY_ID='bench', AWS_SECRET_ACCESS_KEY='bench', AWS_EC2_METADATA_DISABLED='true')
+    proc = subprocess.run([sys.executable, '-c', CHILD], cwd=CRAWLER_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"측정 실패:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main(argv):
+    runs = int(argv[0]) if argv else 15
+    import model_cache
+    if not os.path.exists(model_cache.MODEL_CACHE_FILE):
+        sys.exit(f"캐시 파일이 없습니다: {model_cache.MODEL_CACHE_FILE} (python model_cache.py 먼저 실행)")
+    # 캐시 사용/미사용을 번갈아 실행해 디스크 캐시 등 순서 영향을 줄임
+    samples = {False: [], True: []}
+    for _ in range(runs):
+        for enabled in (False, True):
+            samples[enabled].append(measure(enabled))
+    print(f"runs={runs}, median ms (resource = 리소스 생성, first = import 이후 첫 호출까지 전체)")
+    print(f"{'phase':<10}{'no cache':>10}{'cache':>9}{'saved':>9}")
+    for phase in PHASES:
+        base, cached = (statistics.median(s[phase] for s in samples[enabled]) for enabled in (False, True))
+        print(f"{phase:<10}{base:>10.1f}{cached:>9.1f}{base - cached:>9.1f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,87 @@
+# crawler/bench_parse.py
+"""HTML 추출 백엔드(bs4 / lxml) 파싱 마이크로 벤치마크
+
+두 백엔드의 추출 결과가 완전히 같은지 먼저 확인한 뒤 페이지당 파싱 시간을 비교한다.
+저장해 둔 네이버 페이지가 있으면 인자로 넘기고, 없으면 같은 구조의 합성 페이지를 사용한다.
+
+사용법: python bench_parse.py [sise.html frgn.html] [-n 반복 횟수]
+"""
+import os
+import sys
+import timeit
+sys.path.append(os.path.join(os.path.dirname(__file__), 'python_libs'))
+
+import extractors
+
+HEADER = '''<div id="middle"><div class="h_company"><div class="wrap_company">
+<h2><a href="#" onclick="return false;">삼성전자</a></h2>
+<div class="description"><span class="code">005930</span><span class="kospi">코스피</span></div>
+</div></div>'''
+
+def _filler(rows):
+    # 실제 페이지 크기와 비슷하도록 메뉴/표 등 추출 대상이 아닌 마크업을 채움
+    cells = ''.join(f'<td class="num"><span class="tah p11">{i * 37:,}</span></td>' for i in range(10))
+    body = ''.join(f'<tr><td class="date">2025.01.{i % 28 + 1:02d}</td>{cells}</tr>' for i in range(rows))
+    menu = ''.join(f'<li><a href="/sise/item{i}.naver" class="menu">메뉴 {i}</a></li>' for i in range(200))
+    return f'<div class="lnb"><ul>{menu}</ul></div><table class="type_1">{body}</table>'
+
+def synthetic_sise_page():
+    return f'''<html><head><meta charset="euc-kr"><title>삼성전자 : 네이버 금융</title></head><body>
+{_filler(150)}{HEADER}
+<div class="rate_info"><div class="today">
+<p class="no_today"><em class="no_up"><span class="blind">현재가</span><strong id="_nowVal">71,300</strong></em></p>
+<p class="no_exday"><em class="no_up"><span class="blind">전일대비</span><span class="ico up">상승</span>
+<strong id="_diff"><span class="tah p11 red02">\n\t\t\t\t1,200\n\t\t\t</span></strong></em>
+<em class="no_up"><strong id="_rate"><span class="tah p11 red02">\n\t\t\t\t+1.71%\n\t\t\t</span></strong></em></p>
+</div></div>{_filler(150)}</div></body></html>'''
+
+def synthetic_frgn_page():
+    rows = ''.join(
+        f'''<tr onmouseover="mouseOver(this)" onmouseout="mouseOut(this)">
+<td class="tc"><span class="tah p10 gray03">2025.01.{28 - i:02d}</span></td>
+<td class="num"><span class="tah p11">71,{i:03d}</span></td>
+<td class="num"><em class="bu_p bu_pup"><span class="blind">상승</span></em><span class="tah p11 red02">{i * 100:,}</span></td>
+<td class="num"><span class="tah p11 red01">+0.{i:02d}%</span></td>
+<td class="num"><span class="tah p11">12,345,{i:03d}</span></td>
+<td class="num"><span class="tah p11 red01">+1,{i:03d},000</span></td>
+<td class="num"><span class="tah p11 {'red01' if i % 2 else 'nv01'}">{'' if i % 2 else '-'}{i * 1234567:,}</span></td>
+<td class="num"><span class="tah p11">3,000,000,000</span></td>
+<td class="num"><span class="tah p11">55.{i:02d}%</span></td></tr>
+<tr><td colspan="9" class="blank_09"></td></tr>'''
+        for i in range(20))
+    return f'''<html><head><meta charset="euc-kr"></head><body>{_filler(100)}{HEADER}
+<div class="section inner_sub"><table class="type2"><caption>외국인 기관 순매매 거래량</caption>
+<tr><th>날짜</th><th>종가</th><th>전일비</th><th>등락률</th><th>거래량</th><th>기관</th><th>외국인</th><th>보유주수</th><th>보유율</th></tr>
+{rows}</table></div></div>{_filler(50)}</body></html>'''
+
+def main(argv):
+    runs = 50
+    if '-n' in argv:
+        index = argv.index('-n')
+        runs = int(argv[index + 1])
+        argv = argv[:index] + argv[index + 2:]
+    if len(argv) >= 2:
+        with open(argv[0], encoding='utf-8') as f:
+            sise_html = f.read()
+        with open(argv[1], encoding='utf-8') as f:
+            frgn_html = f.read()
+    else:
+        sise_html, frgn_html = synthetic_sise_page(), synthetic_frgn_page()
+
+    cases = [
+        ('market_page (sise)', lambda backend: extractors.parse_market_page(sise_html, backend)),
+        ('stock_name (sise)', lambda backend: extractors.parse_stock_name(sise_html, backend)),
+        ('foreigner_rows (frgn)', lambda backend: extractors.parse_foreigner_rows(frgn_html, 8, backend)),
+    ]
+    print(f"page sizes: sise={len(sise_html):,} chars, frgn={len(frgn_html):,} chars, runs={runs}")
+    print(f"{'case':<24}{'bs4 ms':>10}{'lxml ms':>10}{'speedup':>9}  identical")
+    for label, parse in cases:
+        expected, actual = parse('bs4'), parse('lxml')
+        identical = repr(expected) == repr(actual)
+        timings = {backend: timeit.timeit(lambda: parse(backend), number=runs) / runs * 1000 for backend in ('bs4', 'lxml')}
+        print(f"{label:<24}{timings['bs4']:>10.2f}{timings['lxml']:>10.2f}{timings['bs4'] / timings['lxml']:>8.1f}x  {identical}")
+        if not identical:
+            print(f"  bs4 : {expected!r}\n  lxml: {actual!r}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
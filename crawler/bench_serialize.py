@@ -0,0 +1,131 @@
+# crawler/bench_serialize.py
+"""MarketData / IndexData 쓰기 직렬화 마이크로 벤치마크
+
+  dict    build_*_item → 지문 → boto3 TypeSerializer (리소스 계층이 요청마다 하는 변환)
+  record  records.py 레코드 → 지문 → AttributeValue 직접 생성 (저수준 client 경로)
+
+두 경로가 같은 AttributeValue와 지문을 만드는지 먼저 확인한 뒤 항목당 시간과 메모리 할당량을 비교한다.
+AttributeValue 비교 외에 BatchWriter가 실제로 직렬화한 BatchWriteItem 요청 본문도 비교한다
+(dict 항목은 리소스, 레코드는 저수준 client로 보내고 before-call 훅에서 본문을 가로채 전송 없이 응답).
+
+사용법: python bench_serialize.py [항목 수] [-n 반복 횟수]
+"""
+import os
+import sys
+import json
+import random
+import timeit
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(__file__), 'python_libs'))
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.awsrequest import AWSResponse
+import aws_clients
+import db
+import records
+
+def sample_rows(count, rng):
+    market = [{
+        'symbol': f'{i:06d}',
+        'date': '2025-01-02',
+        'price': rng.randint(1000, 900000),
+        'change': rng.randint(-20000, 20000),
+        'changeRate': round(rng.uniform(-30, 30), 2),
+        'stockName': '삼성전자',
+        'foreignerNetBuy': [rng.randint(-5_000_000, 5_000_000) for _ in range(8)],
+        'foreignerNetBuyDate': [f'2024-12-{31 - d:02d}' for d in range(8)],
+    } for i in range(count)]
+    indices = [{'name': f'IDX{i}', 'date': '2025-01-02', 'value': round(rng.uniform(500, 3000), 2),
+                'change': round(rng.uniform(-50, 50), 2), 'changeRate': round(rng.uniform(-3, 3), 2)} for i in range(count)]
+    return market, indices
+
+def dict_path(build, rows, serializer):
+    out = []
+    for row in rows:
+        item = db._with_fingerprint(build(row))
+        out.append({name: serializer.serialize(value) for name, value in item.items()})
+    return out
+
+def record_path(record_type, rows):
+    return [record_type.from_dict(row).to_wire() for row in rows]
+
+def _comparable(wire_item):
+    # 생성 시각을 제외하고 비교
+    return {k: v for k, v in wire_item.items() if k not in ('createdAt', 'updatedAt')}
+
+def _capture_requests(client):
+    """client의 BatchWriteItem 요청 본문(JSON)을 모으고 네트워크 전송 없이 빈 응답을 돌려주도록 설정"""
+    bodies = []
+
+    def capture(params, **kwargs):
+        bodies.append(json.loads(params['body']))
+        return AWSResponse(None, 200, {}, None), {'UnprocessedItems': {}}
+
+    client.meta.events.register_first('before-call.dynamodb.BatchWriteItem', capture)
+    return bodies
+
+def _sent_items(bodies):
+    return [request['PutRequest']['Item'] for body in bodies for request in body['RequestItems'][db.TABLE_NAME]]
+
+def check_requests(rows_by_type):
+    """dict(리소스) / 레코드(저수준 client) 경로의 실제 요청 본문이 같은지 확인 → 실패한 종류 목록"""
+    resource = aws_clients.get_resource('dynamodb')
+    resource_bodies = _capture_requests(resource.meta.client)
+    client_bodies = _capture_requests(aws_clients.get_client('dynamodb'))
+    failures = []
+    for label, build, record_type, rows in rows_by_type:
+        del resource_bodies[:], client_bodies[:]
+        with db.BatchWriter(resource=resource) as writer:
+            for row in rows:
+                writer.put(build(row))
+        with db.BatchWriter() as writer:
+            for row in rows:
+                writer.put(record_type.from_dict(row))
+        dict_items, record_items = _sent_items(resource_bodies), _sent_items(client_bodies)
+        wire_keys = all(set(item['PK']) == {'S'} and set(item['SK']) == {'S'} for item in record_items)
+        identical = [_comparable(item) for item in dict_items] == [_comparable(item) for item in record_items]
+        print(f"{label:<12}request items={len(record_items)}, keys as S={wire_keys}, identical to resource body={identical}")
+        if not (wire_keys and identical and len(record_items) == len(rows)):
+            failures.append(label)
+    return failures
+
+def _allocated(call):
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main(argv):
+    runs = 20
+    if '-n' in argv:
+        index = argv.index('-n')
+        runs = int(argv[index + 1])
+        argv = argv[:index] + argv[index + 2:]
+    count = int(argv[0]) if argv else 500
+    market, indices = sample_rows(count, random.Random(0))
+    serializer = TypeSerializer()
+
+    cases = [
+        ('MarketData', lambda: dict_path(db.build_market_data_item, market, serializer),
+         lambda: record_path(records.MarketDataRecord, market)),
+        ('IndexData', lambda: dict_path(db.build_index_data_item, indices, serializer),
+         lambda: record_path(records.IndexDataRecord, indices)),
+    ]
+    failures = check_requests([
+        ('MarketData', db.build_market_data_item, records.MarketDataRecord, market),
+        ('IndexData', db.build_index_data_item, records.IndexDataRecord, indices),
+    ])
+    if failures:
+        sys.exit(f"요청 본문 불일치: {', '.join(failures)}")
+    print(f"items={count}, runs={runs}")
+    print(f"{'case':<12}{'dict us':>10}{'record us':>11}{'speedup':>9}{'dict KB':>10}{'record KB':>11}  identical")
+    for label, dict_call, record_call in cases:
+        identical = [_comparable(item) for item in dict_call()] == [_comparable(item) for item in record_call()]
+        timings = [timeit.timeit(call, number=runs) / runs / count * 1e6 for call in (dict_call, record_call)]
+        peaks = [_allocated(call) / 1024 for call in (dict_call, record_call)]
+        print(f"{label:<12}{timings[0]:>10.2f}{timings[1]:>11.2f}{timings[0] / timings[1]:>8.1f}x"
+              f"{peaks[0]:>10.0f}{peaks[1]:>11.0f}  {identical}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
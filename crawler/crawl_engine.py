@@ -0,0 +1,71 @@
+# crawler/crawl_engine.py
+import os
+import threading
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 동시 처리 한도 (환경 변수로 조정 가능)
+MAX_IN_FLIGHT = int(os.environ.get('CRAWL_MAX_IN_FLIGHT', '16'))
+MAX_PER_HOST = int(os.environ.get('CRAWL_MAX_PER_HOST', '8'))
+
+_host_semaphores = {}
+_host_lock = threading.Lock()
+
+def _host_semaphore(host):
+    """호스트별 동시 요청 세마포어 (워밍된 Lambda 인스턴스에서 재사용)"""
+    with _host_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(MAX_PER_HOST)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+@contextmanager
+def host_slot(url):
+    """같은 호스트로 나가는 요청 수를 MAX_PER_HOST 이하로 제한"""
+    semaphore = _host_semaphore(urlsplit(url).netloc)
+    with semaphore:
+        yield
+
+class CrawlEngine:
+    """심볼 단위 작업과 하위 요청을 병렬로 처리하는 크롤링 엔진
+
+    심볼 작업과 하위 요청은 서로 다른 스레드 풀에서 실행되므로,
+    심볼 작업이 하위 요청 완료를 기다려도 교착 상태가 발생하지 않는다.
+    """
+
+    def __init__(self, max_in_flight=None):
+        self.max_in_flight = max(1, int(max_in_flight or MAX_IN_FLIGHT))
+        self._symbol_pool = None
+        self._fetch_pool = None
+
+    def __enter__(self):
+        self._symbol_pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='crawl-symbol')
+        self._fetch_pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='crawl-fetch')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._symbol_pool.shutdown(wait=True)
+        self._fetch_pool.shutdown(wait=True)
+        self._symbol_pool = None
+        self._fetch_pool = None
+
+    def fan_out(self, *calls):
+        """하위 요청(callable)들을 병렬 실행하고 입력 순서대로 결과 반환"""
+        futures = [self._fetch_pool.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def map(self, worker, items):
+        """각 항목에 worker를 병렬 적용하고 입력 순서대로 결과 반환"""
+        futures = [self._symbol_pool.submit(worker, *item) for item in items]
+        return [future.result() for future in futures]
+
+def crawl(worker, items, max_in_flight=None):
+    """CrawlEngine을 열어 worker(engine, *item)를 모든 항목에 적용"""
+    with CrawlEngine(max_in_flight) as engine:
+        logger.info(f"병렬 크롤링 시작: {len(items)}건 (동시 {engine.max_in_flight}, 호스트당 {MAX_PER_HOST})")
+        return engine.map(lambda *item: worker(engine, *item), items)
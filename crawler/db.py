@@ -1,15 +1,72 @@
 # crawler/db.py
-import boto3
-from botocore.exceptions import ClientError
+import os
+import time
+import random
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from botocore.exceptions import BotoCoreError, ClientError
 import datetime
 from decimal import Decimal
+import aws_clients
+from flow_codec import pack_foreign_flow, unpack_foreign_flow
 
-# DynamoDB 리소스 초기화 (서울 리전)
-dynamodb = boto3.resource('dynamodb', region_name='ap-northeast-2')
-table = dynamodb.Table('fiflow-users')
+TABLE_NAME = os.environ.get('DYNAMODB_TABLE', 'fiflow-users')
 
-def create_market_data(data):
-    # MarketData 저장: 데이터 타입 명확히 처리
+# BatchWriteItem 한 번에 보낼 수 있는 최대 항목 수 및 재시도 설정
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_RETRIES = 5
+BACKOFF_BASE = 0.05
+BACKOFF_CAP = 2.0
+RETRYABLE_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded', 'InternalServerError')
+BATCH_GET_SIZE = 100
+
+# 조회는 기본 테이블 키로 수행 (READ_VIA_GSI=1이면 기존 GSI 조회)
+READ_VIA_GSI = os.environ.get('READ_VIA_GSI', '0') == '1'
+# 새 항목에 GSI 키 속성(symbol_date / index_name_date)을 쓸지 여부: 0이면 GSI로 복제되지 않음 (gsi_migration.py 참고)
+WRITE_GSI_KEYS = os.environ.get('WRITE_GSI_KEYS', '1') == '1'
+GSI_KEY_ATTRS = ('symbol_date', 'index_name_date')
+
+# MarketData 외국인 순매매 배열을 foreignerFlow 바이너리 하나로 압축 저장할지 여부 (조회 시 자동 복원)
+MARKETDATA_COMPACT = os.environ.get('MARKETDATA_COMPACT', '0') == '1'
+FLOW_ATTR = 'foreignerFlow'
+
+# 쓰기 생략(write elision): 마지막으로 저장한 항목 지문을 기억해 값이 같으면 쓰기를 건너뜀
+FINGERPRINT_ATTR = 'fingerprint'
+FINGERPRINT_EXCLUDED = frozenset(['createdAt', 'updatedAt', FINGERPRINT_ATTR])
+FINGERPRINT_CACHE_SIZE = int(os.environ.get('FINGERPRINT_CACHE_SIZE', '50000'))
+# 생략 전에 저장된 지문을 BatchGetItem으로 확인할지 여부 (끄면 이 인스턴스의 메모리 지문만 사용)
+ELIDE_STORED_CHECK = os.environ.get('ELIDE_STORED_CHECK', '1') == '1'
+
+# DynamoDB 리소스는 첫 사용 시 생성 (콜드 스타트에서 boto3 모델 로딩을 미룸)
+# aws_clients의 공유 세션/클라이언트를 사용하고, _resource를 지정하면 그 객체를 대신 사용
+# 리소스와 get_table()의 Table은 워커 스레드가 함께 쓴다: 여기서 쓰는 batch_write_item / batch_get_item /
+# get_item / put_item / delete_item / query는 호출마다 스레드 안전한 meta.client로 요청만 보내는 액션이고,
+# 객체 상태를 바꾸는 load() / reload()나 리소스 컬렉션은 쓰지 않는다.
+_resource = None
+_table = None
+
+def get_resource():
+    # DynamoDB 리소스 (서울 리전, 튜닝된 공유 클라이언트)
+    return _resource or aws_clients.get_resource('dynamodb')
+
+def get_table():
+    global _table
+    if _table is None:
+        _table = get_resource().Table(TABLE_NAME)
+    return _table
+
+def __getattr__(name):
+    # 기존 db.dynamodb / db.table 접근 호환 (첫 접근 시 생성)
+    if name == 'dynamodb':
+        return get_resource()
+    if name == 'table':
+        return get_table()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def build_market_data_item(data):
+    # MarketData 항목 생성: 데이터 타입 명확히 처리
     item = {
         'PK': f'STOCK#{data["symbol"]}',  # String
         'SK': f'MARKETDATA#{data["date"]}',  # String
@@ -25,16 +82,91 @@ def create_market_data(data):
         'createdAt': datetime.datetime.utcnow().isoformat() + 'Z',
         'updatedAt': datetime.datetime.utcnow().isoformat() + 'Z'
     }
+    if MARKETDATA_COMPACT:
+        # List 두 개(요소 16개) 대신 Binary 하나 → 기본 테이블과 GSI 복제본 모두 작아짐
+        item[FLOW_ATTR] = pack_foreign_flow(item.pop('foreignerNetBuy'), item.pop('foreignerNetBuyDate'))
+    if not WRITE_GSI_KEYS:
+        del item['symbol_date']
+    return item
+
+def decode_market_data_item(item):
+    # 압축 저장된 MarketData를 foreignerNetBuy/foreignerNetBuyDate 배열 형태로 복원
+    if item and FLOW_ATTR in item:
+        item['foreignerNetBuy'], item['foreignerNetBuyDate'] = unpack_foreign_flow(item.pop(FLOW_ATTR))
+    return item
+
+LATEST_SK = 'LATEST'
+
+def build_latest_market_data_item(data):
+    # 종목별 최신 시세 읽기 모델 (STOCK#<symbol> / LATEST): API 응답 형태 그대로, 외국인 순매매는 날짜와 묶어 저장
+    return {
+        'PK': f'STOCK#{data["symbol"]}',
+        'SK': LATEST_SK,
+        'symbol': data["symbol"],
+        'date': data["date"],
+        'price': int(data["price"]),
+        'change': int(data["change"]),
+        'changeRate': Decimal(str(data["changeRate"])),
+        'stockName': data["stockName"],
+        'foreignerNetBuy': [
+            {'date': date, 'net_buy': int(net_buy)}
+            for net_buy, date in zip(data.get("foreignerNetBuy", []), data.get("foreignerNetBuyDate", []))
+            if date
+        ],
+        'updatedAt': datetime.datetime.utcnow().isoformat() + 'Z'
+    }
+
+def fingerprint(item):
+    # 업무 필드(생성/수정 시각 제외) 지문: 정렬된 JSON의 BLAKE2b 해시
+    fields = {k: v for k, v in item.items() if k not in FINGERPRINT_EXCLUDED}
+    payload = json.dumps(fields, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+_fingerprints = OrderedDict()
+_fingerprints_lock = threading.Lock()
+
+def _remember_fingerprint(key, value):
+    # 워밍된 Lambda 인스턴스에서 유지되는 (PK, SK) -> 마지막 저장 지문
+    with _fingerprints_lock:
+        _fingerprints[key] = value
+        _fingerprints.move_to_end(key)
+        while len(_fingerprints) > FINGERPRINT_CACHE_SIZE:
+            _fingerprints.popitem(last=False)
+
+def _last_fingerprint(key):
+    with _fingerprints_lock:
+        return _fingerprints.get(key)
+
+def _with_fingerprint(item):
+    if FINGERPRINT_ATTR not in item:
+        item[FINGERPRINT_ATTR] = fingerprint(item)
+    return item
+
+def create_market_data(data):
+    # MarketData 저장
+    item = _with_fingerprint(build_market_data_item(data))
     try:
-        table.put_item(Item=item)
+        get_table().put_item(Item=item)
+        _remember_fingerprint((item['PK'], item['SK']), item[FINGERPRINT_ATTR])
         print(f"MarketData 저장 성공: {data['symbol']}_{data['date']}")
         return {"status": "success", "symbol": data["symbol"], "date": data["date"]}
     except ClientError as e:
         print(f"MarketData 저장 오류: {e}")
         raise e
 
-def create_index_data(data):
-    # IndexData 저장: 데이터 타입 명확히 처리
+def create_latest_market_data(data):
+    # 종목 LATEST 읽기 모델 저장
+    item = _with_fingerprint(build_latest_market_data_item(data))
+    try:
+        get_table().put_item(Item=item)
+        _remember_fingerprint((item['PK'], item['SK']), item[FINGERPRINT_ATTR])
+        return {"status": "success", "symbol": data["symbol"]}
+    except ClientError as e:
+        print(f"최신 MarketData 저장 오류: {e}")
+        raise e
+
+def build_index_data_item(data):
+    # IndexData 항목 생성: 데이터 타입 명확히 처리
     item = {
         'PK': f'INDEX#{data["name"]}',  # String
         'SK': f'DATA#{data["date"]}',  # String
@@ -47,40 +179,357 @@ def create_index_data(data):
         'createdAt': datetime.datetime.utcnow().isoformat() + 'Z',
         'updatedAt': datetime.datetime.utcnow().isoformat() + 'Z'
     }
+    if not WRITE_GSI_KEYS:
+        del item['index_name_date']
+    return item
+
+def create_index_data(data):
+    # IndexData 저장
+    item = _with_fingerprint(build_index_data_item(data))
     try:
-        table.put_item(Item=item)
+        get_table().put_item(Item=item)
+        _remember_fingerprint((item['PK'], item['SK']), item[FINGERPRINT_ATTR])
         print(f"IndexData 저장 성공: {data['name']}_{data['date']}")
         return {"status": "success", "name": data["name"], "date": data["date"]}
     except ClientError as e:
         print(f"IndexData 저장 오류: {e}")
         raise e
 
-def get_market_data(symbol, date):
-    # MarketData 조회: GSI 사용
+def _backoff(attempt):
+    # 지수 백오프 + 지터
+    time.sleep(min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.0))
+
+def _batch_get_items(keys, projection=None, expression_names=None, resource=None, table_name=TABLE_NAME, max_retries=BATCH_WRITE_MAX_RETRIES, consistent_read=False):
+    # BatchGetItem 100개 단위 조회, UnprocessedKeys는 백오프 후 재시도 → {(PK, SK): item}
+    resource = resource or get_resource()
+    found = {}
+    keys = [{'PK': pk, 'SK': sk} for pk, sk in dict.fromkeys(keys)]
+    for start in range(0, len(keys), BATCH_GET_SIZE):
+        request = {'Keys': keys[start:start + BATCH_GET_SIZE]}
+        if projection:
+            request['ProjectionExpression'] = projection
+        if expression_names:
+            request['ExpressionAttributeNames'] = expression_names
+        if consistent_read:
+            request['ConsistentRead'] = True
+        attempt = 0
+        while request:
+            try:
+                response = resource.batch_get_item(RequestItems={table_name: request})
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                if code not in RETRYABLE_ERRORS or attempt >= max_retries:
+                    raise
+            else:
+                for item in response.get('Responses', {}).get(table_name, []):
+                    found[(item['PK'], item['SK'])] = item
+                request = response.get('UnprocessedKeys', {}).get(table_name)
+                if not request:
+                    break
+                if attempt >= max_retries:
+                    raise RuntimeError(f"BatchGetItem 미처리 키 {len(request['Keys'])}건")
+            _backoff(attempt)
+            attempt += 1
+    return found
+
+_serializer = None
+
+def _is_record(item):
+    # records.py 레코드 (AttributeValue로 직접 직렬화)
+    return hasattr(item, 'to_wire')
+
+def _item_fingerprint(item):
+    return item.fingerprint if _is_record(item) else item[FINGERPRINT_ATTR]
+
+def _to_wire(item):
+    # 레코드는 자체 직렬화, dict 항목은 boto3 TypeSerializer로 AttributeValue 변환
+    global _serializer
+    if _is_record(item):
+        return item.to_wire()
+    if _serializer is None:
+        from boto3.dynamodb.types import TypeSerializer
+        _serializer = TypeSerializer()
+    return {name: _serializer.serialize(value) for name, value in item.items()}
+
+def _request_key(item):
+    # UnprocessedItems 항목 → (PK, SK) (리소스 형식 / AttributeValue 형식 모두)
+    pk, sk = item['PK'], item['SK']
+    return (pk['S'], sk['S']) if isinstance(pk, dict) else (pk, sk)
+
+class BatchWriter:
+    """BatchWriteItem 기반 일괄 저장기 (크롤링 파이프라인 단계)
+
+    여러 스레드에서 put()으로 항목을 흘려보내면 25개 단위로 전송하고,
+    UnprocessedItems는 백오프 후 재시도한다. 항목마다 붙인 tag(예: 종목 코드)별
+    저장 결과는 results에 'success' / 'failed'로 기록된다 (연결 오류도 예외 대신 'failed').
+    elide=True이면 업무 필드 지문이 마지막 저장본과 같은 항목은 쓰지 않고 성공으로 처리하며,
+    건너뛴 건수는 elided에 누적된다.
+    resource에는 batch_write_item(RequestItems=...)을 (쓰기 생략 시 batch_get_item도) 제공하는
+    어떤 객체든 넘길 수 있다.
+    put()에는 dict 항목 외에 records.py 레코드도 넘길 수 있으며, 레코드가 든 배치는
+    AttributeValue 형식으로 직렬화해 저수준 client(기본값: aws_clients.get_client('dynamodb'))로 보낸다.
+    """
+
+    def __init__(self, resource=None, table_name=TABLE_NAME, max_retries=BATCH_WRITE_MAX_RETRIES, elide=False, client=None):
+        self._resource = resource
+        self._client = client
+        self.table_name = table_name
+        self.max_retries = max_retries
+        self.elide = elide
+        self.elided = 0
+        self.results = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def put(self, item, tag=None):
+        # 같은 키가 한 배치에 두 번 들어가면 ValidationException이 나므로 마지막 값만 유지
+        if _is_record(item):
+            key = item.key
+        else:
+            key = (item['PK'], item['SK'])
+            _with_fingerprint(item)
+        with self._lock:
+            _, tags = self._pending.pop(key, (None, []))
+            if tag is not None:
+                tags.append(tag)
+            self._pending[key] = (item, tags)
+            if len(self._pending) < BATCH_WRITE_SIZE:
+                return
+            batch = self._take()
+        self._write_batch(batch)
+
+    def flush(self):
+        while True:
+            with self._lock:
+                batch = self._take()
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def _take(self):
+        keys = list(self._pending)[:BATCH_WRITE_SIZE]
+        return [(key, *self._pending.pop(key)) for key in keys]
+
+    def _unchanged_keys(self, batch):
+        # 메모리 지문은 힌트: 다르면 바로 쓰고, 같거나 없으면 저장된 지문으로 확인 (다른 인스턴스가 바꿨을 수 있음)
+        candidates = [(key, item) for key, item, _ in batch if _last_fingerprint(key) in (None, _item_fingerprint(item))]
+        if not candidates:
+            return set()
+        if not ELIDE_STORED_CHECK:
+            # 저장본 확인을 끄면 이 인스턴스가 마지막으로 쓴 지문만 믿음
+            return {key for key, item in candidates if _last_fingerprint(key) is not None}
+        try:
+            stored = _batch_get_items([key for key, _ in candidates], projection=f'PK, SK, {FINGERPRINT_ATTR}',
+                                      resource=self._resource, table_name=self.table_name, max_retries=self.max_retries)
+        except (ClientError, BotoCoreError, RuntimeError) as e:
+            print(f"저장된 지문 조회 오류: {e}")
+            return set()
+        unchanged = set()
+        for key, item in candidates:
+            stored_fingerprint = stored.get(key, {}).get(FINGERPRINT_ATTR)
+            if stored_fingerprint:
+                _remember_fingerprint(key, stored_fingerprint)
+                if stored_fingerprint == _item_fingerprint(item):
+                    unchanged.add(key)
+        return unchanged
+
+    def _write_batch(self, batch):
+        if self.elide:
+            unchanged = self._unchanged_keys(batch)
+            if unchanged:
+                self._record([entry for entry in batch if entry[0] in unchanged], set())
+                with self._lock:
+                    self.elided += len(unchanged)
+                batch = [entry for entry in batch if entry[0] not in unchanged]
+                if not batch:
+                    return
+        remaining = {key: item for key, item, _ in batch}
+        wire = any(_is_record(item) for item in remaining.values())
+        writer = self._wire_client() if wire else (self._resource or get_resource())
+        attempt = 0
+        while remaining:
+            try:
+                response = writer.batch_write_item(RequestItems={
+                    self.table_name: [{'PutRequest': {'Item': _to_wire(item) if wire else item}} for item in remaining.values()]
+                })
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                if code not in RETRYABLE_ERRORS or attempt >= self.max_retries:
+                    print(f"BatchWriteItem 오류: {e}")
+                    break
+            except BotoCoreError as e:
+                # 연결/읽기 타임아웃 등은 botocore 재시도 후에도 남은 오류이므로 남은 항목을 실패로 기록
+                print(f"BatchWriteItem 연결 오류: {e}")
+                break
+            else:
+                unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+                unprocessed_keys = {_request_key(request['PutRequest']['Item']) for request in unprocessed}
+                remaining = {key: item for key, item in remaining.items() if key in unprocessed_keys}
+                if not remaining or attempt >= self.max_retries:
+                    break
+            _backoff(attempt)
+            attempt += 1
+        for key, item, _ in batch:
+            if key not in remaining:
+                _remember_fingerprint(key, _item_fingerprint(item))
+        self._record(batch, remaining)
+        print(f"BatchWriteItem 완료: {len(batch) - len(remaining)}/{len(batch)}건 저장")
+
+    def _wire_client(self):
+        # 리소스의 meta.client는 TypeSerializer 훅이 걸려 있어 AttributeValue를 한 번 더 감싸므로 쓰지 않음
+        if self._client is None:
+            self._client = aws_clients.get_client('dynamodb')
+        return self._client
+
+    def _record(self, batch, failed_keys):
+        with self._lock:
+            for key, _, tags in batch:
+                status = 'failed' if key in failed_keys else 'success'
+                for tag in tags:
+                    if self.results.get(tag) != 'failed':
+                        self.results[tag] = status
+
+def _query_gsi(index_name, key_name, key_value):
+    # 기존 GSI 조회 경로 (READ_VIA_GSI=1 호환용)
+    response = get_table().query(
+        IndexName=index_name,
+        KeyConditionExpression=f'{key_name} = :key',
+        ExpressionAttributeValues={':key': key_value}
+    )
+    return response.get('Items', [])
+
+def _get_base_item(pk, sk, consistent_read=False):
+    # 기본 테이블 키(PK, SK) GetItem → [item] 또는 [] (기존 GSI 조회와 같은 반환 형태)
+    response = get_table().get_item(Key={'PK': pk, 'SK': sk}, ConsistentRead=consistent_read)
+    return [response['Item']] if 'Item' in response else []
+
+def get_market_data(symbol, date, consistent_read=False):
+    # MarketData 조회: 기본 테이블 키(STOCK#/MARKETDATA#) GetItem
     try:
-        response = table.query(
-            IndexName='market-data-index',
-            KeyConditionExpression='symbol_date = :sd',
-            ExpressionAttributeValues={
-                ':sd': f'{symbol}_{date}'
-            }
-        )
-        return response.get('Items', [])
+        if READ_VIA_GSI:
+            items = _query_gsi('market-data-index', 'symbol_date', f'{symbol}_{date}')
+        else:
+            items = _get_base_item(f'STOCK#{symbol}', f'MARKETDATA#{date}', consistent_read)
+        return [decode_market_data_item(item) for item in items]
     except ClientError as e:
         print(f"MarketData 조회 오류: {e}")
         raise e
 
-def get_index_data(name, date):
-    # IndexData 조회: GSI 사용
+def get_latest_market_data(symbol):
+    # 종목 최신 시세 조회: LATEST 항목 GetItem (강한 일관성), 없으면 None
     try:
-        response = table.query(
-            IndexName='index-data-index',
-            KeyConditionExpression='index_name_date = :ind',
-            ExpressionAttributeValues={
-                ':ind': f'{name}_{date}'
-            }
-        )
-        return response.get('Items', [])
+        response = get_table().get_item(Key={'PK': f'STOCK#{symbol}', 'SK': LATEST_SK}, ConsistentRead=True)
+        return response.get('Item')
+    except ClientError as e:
+        print(f"최신 MarketData 조회 오류: {e}")
+        raise e
+
+def batch_get_latest_market_data(symbols):
+    # 여러 종목의 LATEST 항목을 강한 일관성 BatchGetItem으로 일괄 조회 → {symbol: item}
+    found = _batch_get_items([(f'STOCK#{symbol}', LATEST_SK) for symbol in symbols], consistent_read=True)
+    return {pk[len('STOCK#'):]: item for (pk, _), item in found.items()}
+
+def get_index_data(name, date, consistent_read=False):
+    # IndexData 조회: 기본 테이블 키(INDEX#/DATA#) GetItem
+    try:
+        if READ_VIA_GSI:
+            return _query_gsi('index-data-index', 'index_name_date', f'{name}_{date}')
+        return _get_base_item(f'INDEX#{name}', f'DATA#{date}', consistent_read)
     except ClientError as e:
         print(f"IndexData 조회 오류: {e}")
-        raise e
\ No newline at end of file
+        raise e
+
+def _projection(attributes, required=('PK', 'SK')):
+    # 속성 이름 목록 → (ProjectionExpression, ExpressionAttributeNames), 예약어 충돌을 피하려고 모두 치환
+    if not attributes:
+        return None, None
+    names = list(dict.fromkeys([*required, *attributes]))
+    if FLOW_ATTR not in names and ('foreignerNetBuy' in names or 'foreignerNetBuyDate' in names):
+        names.append(FLOW_ATTR)  # 압축 저장된 항목도 복원할 수 있도록
+    placeholders = {f'#p{i}': name for i, name in enumerate(names)}
+    return ', '.join(placeholders), placeholders
+
+def batch_get_market_data(symbols, date, attributes=None, consistent_read=False, fallback=True):
+    # 여러 종목의 특정 날짜 MarketData를 기본 테이블 키(STOCK#/MARKETDATA#)로 일괄 조회 → {symbol: item}
+    # BatchGetItem이 실패하면(연결 오류 포함, fallback=True) 종목별 단건 조회(get_market_data)로 대체
+    symbols = list(dict.fromkeys(symbols))
+    projection, names = _projection(attributes)
+    try:
+        found = _batch_get_items([(f'STOCK#{symbol}', f'MARKETDATA#{date}') for symbol in symbols],
+                                 projection=projection, expression_names=names, consistent_read=consistent_read)
+    except (ClientError, BotoCoreError, RuntimeError) as e:
+        if not fallback:
+            raise
+        print(f"MarketData 일괄 조회 오류, 종목별 조회로 대체: {e}")
+        return {symbol: items[0] for symbol in symbols for items in [get_market_data(symbol, date)] if items}
+    return {pk[len('STOCK#'):]: decode_market_data_item(item) for (pk, _), item in found.items()}
+
+def batch_get_index_data(names, date, attributes=None, consistent_read=False, fallback=True):
+    # 여러 지수의 특정 날짜 IndexData를 기본 테이블 키(INDEX#/DATA#)로 일괄 조회 → {name: item}
+    # BatchGetItem이 실패하면(연결 오류 포함, fallback=True) 지수별 단건 조회(get_index_data)로 대체
+    names = list(dict.fromkeys(names))
+    projection, expression_names = _projection(attributes)
+    try:
+        found = _batch_get_items([(f'INDEX#{name}', f'DATA#{date}') for name in names],
+                                 projection=projection, expression_names=expression_names, consistent_read=consistent_read)
+    except (ClientError, BotoCoreError, RuntimeError) as e:
+        if not fallback:
+            raise
+        print(f"IndexData 일괄 조회 오류, 지수별 조회로 대체: {e}")
+        return {name: items[0] for name in names for items in [get_index_data(name, date)] if items}
+    return {pk[len('INDEX#'):]: item for (pk, _), item in found.items()}
+
+RANGE_END = '9999-12-31'
+
+def query_range(pk, sk_prefix, start=None, end=None, attributes=None, newest_first=False, limit=None, consistent_read=False):
+    # PK 하나의 SK BETWEEN <prefix><start> AND <prefix><end> 범위를 페이지 단위로 끝까지 읽는 제너레이터
+    # limit이 있으면 그 개수만큼만 읽고 멈춤 (newest_first=True와 함께 쓰면 최근 N개)
+    projection, names = _projection(attributes)
+    kwargs = {
+        'KeyConditionExpression': 'PK = :pk AND SK BETWEEN :low AND :high',
+        'ExpressionAttributeValues': {':pk': pk, ':low': f'{sk_prefix}{start or ""}', ':high': f'{sk_prefix}{end or RANGE_END}'},
+        'ScanIndexForward': not newest_first,
+        'ConsistentRead': consistent_read,
+    }
+    if projection:
+        kwargs.update(ProjectionExpression=projection, ExpressionAttributeNames=names)
+    remaining = limit
+    try:
+        while remaining is None or remaining > 0:
+            if remaining is not None:
+                kwargs['Limit'] = remaining
+            response = get_table().query(**kwargs)
+            items = response.get('Items', [])
+            yield from items
+            if remaining is not None:
+                remaining -= len(items)
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return
+            kwargs['ExclusiveStartKey'] = last_key
+    except ClientError as e:
+        print(f"범위 조회 오류 ({pk}): {e}")
+        raise e
+
+def iter_market_history(symbol, start=None, end=None, attributes=None, newest_first=False, limit=None):
+    # 종목 MarketData 기간 조회 (기본 테이블 STOCK#<symbol> / MARKETDATA#<date>, 압축 항목은 복원)
+    for item in query_range(f'STOCK#{symbol}', 'MARKETDATA#', start, end, attributes, newest_first, limit):
+        yield decode_market_data_item(item)
+
+def iter_index_history(name, start=None, end=None, attributes=None, newest_first=False, limit=None):
+    # 지수 IndexData 기간 조회 (기본 테이블 INDEX#<name> / DATA#<date>)
+    yield from query_range(f'INDEX#{name}', 'DATA#', start, end, attributes, newest_first, limit)
+
+def get_recent_market_data(symbol, n, attributes=None):
+    # 최근 n개 거래일 MarketData (최신순)
+    return list(iter_market_history(symbol, attributes=attributes, newest_first=True, limit=n))
+
+def get_recent_index_data(name, n, attributes=None):
+    # 최근 n개 거래일 IndexData (최신순)
+    return list(iter_index_history(name, attributes=attributes, newest_first=True, limit=n))
@@ -0,0 +1,193 @@
+# crawler/extractors.py
+import os
+import re
+import threading
+
+# HTML 추출 백엔드: lxml (XPath 사전 컴파일, 기본값) | bs4 (BeautifulSoup 전체 트리)
+PARSER_BACKEND = os.environ.get('PARSER_BACKEND', 'lxml')
+
+STOCK_NAME_SELECTOR = "#middle > div.h_company > div.wrap_company > h2 > a"
+FOREIGNER_ROW_SELECTOR = "div.inner_sub table.type2 tr[onmouseover]"
+MARKET_SUM_ROW_SELECTOR = "table.type_2 tr"
+LAST_PAGE_SELECTOR = "td.pgRR a"
+
+def _has_class(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+def _market_values(now_text, diff_text, rate_text, exday_text):
+    """sise 페이지 텍스트 → (price, change, changeRate) 변환 (백엔드 공통)"""
+    price = int(now_text.replace(",", ""))
+    change_text = diff_text.strip().replace(",", "")
+    change_rate_text = rate_text.strip().replace("%", "")
+    change = 0
+    if '상승' in exday_text:
+        change = int(re.search(r'\d+', change_text).group())
+    elif '하락' in exday_text:
+        change = -int(re.search(r'\d+', change_text).group())
+    return price, change, float(change_rate_text)
+
+def _foreigner_row(cells):
+    return {'date': cells[0].strip(), 'net_buy': int(cells[6].strip().replace(",", "") or 0)}
+
+def _market_sum_row(href, name, price_text, diff_text, rate_text):
+    """시가총액 목록 한 행 → {'symbol', 'stockName', 'price', 'change', 'changeRate'} (종목 링크 없는 행은 None)"""
+    code = re.search(r'code=(\w+)', href or '')
+    if not code:
+        return None
+    digits = re.search(r'\d[\d,]*', diff_text)
+    change = int(digits.group().replace(",", "")) if digits else 0
+    rate_text = rate_text.strip().replace("%", "")
+    if '하락' in diff_text or '하한' in diff_text or ('상승' not in diff_text and '상한' not in diff_text and rate_text.startswith('-')):
+        change = -change
+    return {
+        "symbol": code.group(1),
+        "stockName": name.strip(),
+        "price": int(price_text.strip().replace(",", "")),
+        "change": change,
+        "changeRate": float(rate_text),
+    }
+
+def _last_page(href):
+    page = re.search(r'page=(\d+)', href or '')
+    return int(page.group(1)) if page else 1
+
+class Bs4Extractor:
+    """BeautifulSoup + soupsieve CSS 선택자 기반 추출기 (기존 구현)"""
+
+    name = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._beautiful_soup = BeautifulSoup
+
+    def _soup(self, html):
+        return self._beautiful_soup(html, 'lxml')
+
+    def _stock_name(self, soup):
+        element = soup.select_one(STOCK_NAME_SELECTOR)
+        return (element.text.strip() or None) if element else None
+
+    def stock_name(self, html):
+        return self._stock_name(self._soup(html))
+
+    def market_page(self, html):
+        soup = self._soup(html)
+        price, change, change_rate = _market_values(
+            soup.select_one("#_nowVal").text,
+            soup.select_one("#_diff").text,
+            soup.select_one("#_rate").text,
+            soup.select_one("p.no_exday").text,
+        )
+        return {"price": price, "change": change, "changeRate": change_rate, "stockName": self._stock_name(soup)}
+
+    def foreigner_rows(self, html, limit=None):
+        rows = self._soup(html).select(FOREIGNER_ROW_SELECTOR)[:limit]
+        return [_foreigner_row([td.text for td in row.select('td')]) for row in rows]
+
+    def market_sum_page(self, html):
+        soup = self._soup(html)
+        rows = []
+        for row in soup.select(MARKET_SUM_ROW_SELECTOR):
+            link = row.select_one("a.tltle")
+            cells = row.select('td')
+            if link is None or len(cells) < 5:
+                continue
+            # 등락 방향은 blind 텍스트 또는 화살표 이미지 alt로 표시됨
+            diff_text = cells[3].text + ' '.join(img.get('alt', '') for img in cells[3].select('img'))
+            parsed = _market_sum_row(link.get('href'), link.text, cells[2].text, diff_text, cells[4].text)
+            if parsed:
+                rows.append(parsed)
+        last = soup.select_one(LAST_PAGE_SELECTOR)
+        return rows, _last_page(last.get('href') if last else None)
+
+class LxmlExtractor:
+    """lxml.html + 사전 컴파일된 XPath 기반 추출기 (BeautifulSoup 트리 생성 없음)"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        from lxml import etree, html as lxml_html
+        self._parse = lxml_html.document_fromstring
+        self._now = etree.XPath('//*[@id="_nowVal"]')
+        self._diff = etree.XPath('//*[@id="_diff"]')
+        self._rate = etree.XPath('//*[@id="_rate"]')
+        self._exday = etree.XPath(f'//p[{_has_class("no_exday")}]')
+        self._stock_name_xpath = etree.XPath(
+            f'//*[@id="middle"]/div[{_has_class("h_company")}]/div[{_has_class("wrap_company")}]/h2/a')
+        self._foreigner_rows = etree.XPath(
+            f'//div[{_has_class("inner_sub")}]//table[{_has_class("type2")}]//tr[@onmouseover]')
+        self._cells = etree.XPath('.//td')
+        self._market_sum_rows = etree.XPath(f'//table[{_has_class("type_2")}]//tr[.//a[{_has_class("tltle")}]]')
+        self._market_sum_link = etree.XPath(f'.//a[{_has_class("tltle")}]')
+        self._img_alts = etree.XPath('.//img/@alt')
+        self._last_page_href = etree.XPath(f'//td[{_has_class("pgRR")}]//a/@href')
+        self._text = etree.XPath('string()')
+
+    def _first_text(self, xpath, doc):
+        # bs4 select_one(...).text 와 같이 첫 번째 일치 요소의 전체 하위 텍스트
+        return str(self._text(xpath(doc)[0]))
+
+    def _stock_name(self, doc):
+        elements = self._stock_name_xpath(doc)
+        return (str(self._text(elements[0])).strip() or None) if elements else None
+
+    def stock_name(self, html):
+        return self._stock_name(self._parse(html))
+
+    def market_page(self, html):
+        doc = self._parse(html)
+        price, change, change_rate = _market_values(
+            self._first_text(self._now, doc),
+            self._first_text(self._diff, doc),
+            self._first_text(self._rate, doc),
+            self._first_text(self._exday, doc),
+        )
+        return {"price": price, "change": change, "changeRate": change_rate, "stockName": self._stock_name(doc)}
+
+    def foreigner_rows(self, html, limit=None):
+        rows = self._foreigner_rows(self._parse(html))[:limit]
+        return [_foreigner_row([str(self._text(td)) for td in self._cells(row)]) for row in rows]
+
+    def market_sum_page(self, html):
+        doc = self._parse(html)
+        rows = []
+        for row in self._market_sum_rows(doc):
+            link = self._market_sum_link(row)[0]
+            cells = self._cells(row)
+            if len(cells) < 5:
+                continue
+            diff_text = str(self._text(cells[3])) + ' '.join(str(alt) for alt in self._img_alts(cells[3]))
+            parsed = _market_sum_row(link.get('href'), str(self._text(link)), str(self._text(cells[2])), diff_text, str(self._text(cells[4])))
+            if parsed:
+                rows.append(parsed)
+        last = self._last_page_href(doc)
+        return rows, _last_page(str(last[0]) if last else None)
+
+BACKENDS = {'lxml': LxmlExtractor, 'bs4': Bs4Extractor}
+_instances = {}
+_instances_lock = threading.Lock()
+
+def get_extractor(backend=None):
+    """백엔드 이름으로 추출기 반환 (XPath 컴파일은 백엔드당 1회)"""
+    backend = backend or PARSER_BACKEND
+    with _instances_lock:
+        extractor = _instances.get(backend)
+        if extractor is None:
+            extractor = _instances[backend] = BACKENDS[backend]()
+        return extractor
+
+def parse_market_page(html, backend=None):
+    """sise 페이지 → price/change/changeRate/stockName"""
+    return get_extractor(backend).market_page(html)
+
+def parse_stock_name(html, backend=None):
+    """종목 페이지 공통 헤더의 종목명 (없으면 None)"""
+    return get_extractor(backend).stock_name(html)
+
+def parse_foreigner_rows(html, limit=None, backend=None):
+    """frgn 페이지 외국인 매매 표의 행 목록 [{'date', 'net_buy'}]"""
+    return get_extractor(backend).foreigner_rows(html, limit)
+
+def parse_market_sum_page(html, backend=None):
+    """시가총액 목록 페이지 → (행 목록, 마지막 페이지 번호)"""
+    return get_extractor(backend).market_sum_page(html)
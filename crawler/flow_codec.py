@@ -0,0 +1,76 @@
+# crawler/flow_codec.py
+import datetime
+
+# 외국인 순매매 배열 압축 형식 (MarketData.foreignerFlow, DynamoDB Binary)
+#   [버전 1B][행 수 n][날짜 존재 비트맵][기준일(1970-01-01부터 일수)][이후 날짜의 직전 날짜 대비 일수 차 ...][순매매 n개]
+# 정수는 모두 LEB128 varint, 부호 있는 값(일수 차, 순매매)은 zigzag 인코딩.
+# 빈 날짜('')는 비트맵으로만 표시하고 순매매 값은 그대로 유지한다.
+FORMAT_VERSION = 1
+EPOCH = datetime.date(1970, 1, 1)
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+def pack_foreign_flow(net_buys, dates):
+    """(순매매 배열, YYYY-MM-DD 날짜 배열) → bytes"""
+    if len(net_buys) != len(dates):
+        raise ValueError(f"순매매({len(net_buys)})와 날짜({len(dates)}) 길이가 다릅니다.")
+    out = bytearray([FORMAT_VERSION])
+    _write_varint(out, len(dates))
+    present = [i for i, date in enumerate(dates) if date]
+    _write_varint(out, sum(1 << i for i in present))
+    previous = None
+    for i in present:
+        day = (datetime.date.fromisoformat(dates[i]) - EPOCH).days
+        if previous is None:
+            _write_varint(out, day)
+        else:
+            _write_varint(out, _zigzag(previous - day))
+        previous = day
+    for net_buy in net_buys:
+        _write_varint(out, _zigzag(int(net_buy)))
+    return bytes(out)
+
+def unpack_foreign_flow(data):
+    """pack_foreign_flow 결과 → (순매매 배열, YYYY-MM-DD 날짜 배열)"""
+    data = bytes(getattr(data, 'value', data))  # boto3 Binary 또는 bytes
+    if not data or data[0] != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 foreignerFlow 형식: {data[:1]!r}")
+    count, pos = _read_varint(data, 1)
+    bitmap, pos = _read_varint(data, pos)
+    dates = [''] * count
+    previous = None
+    for i in range(count):
+        if not bitmap >> i & 1:
+            continue
+        value, pos = _read_varint(data, pos)
+        previous = value if previous is None else previous - _unzigzag(value)
+        dates[i] = (EPOCH + datetime.timedelta(days=previous)).isoformat()
+    net_buys = []
+    for _ in range(count):
+        value, pos = _read_varint(data, pos)
+        net_buys.append(_unzigzag(value))
+    return net_buys, dates
@@ -0,0 +1,164 @@
+# crawler/foreign_history.py
+import sys
+import os
+import vendor_path
+
+import time
+import json
+import logging
+import datetime
+import http_client
+import extractors
+from crawl_engine import crawl
+from db import BatchWriter, query_range, _batch_get_items
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 외국인 순매매 이력: 종목·거래일마다 한 항목 (PK=STOCK#<symbol>, SK=FRGN#YYYY-MM-DD, netBuy)
+# GSI 키 속성이 없으므로 어떤 GSI에도 복제되지 않는다.
+FRGN_URL = "https://finance.naver.com/item/frgn.naver?code={symbol}&page={page}"
+HISTORY_SK_PREFIX = 'FRGN#'
+PROGRESS_SK = 'FRGN_BACKFILL'
+# 백필할 최대 페이지 수 (페이지당 20거래일) 및 종목당 동시에 받을 페이지 수
+BACKFILL_PAGES = int(os.environ.get('FRGN_BACKFILL_PAGES', '10'))
+BACKFILL_WINDOW = int(os.environ.get('FRGN_BACKFILL_WINDOW', '4'))
+# Lambda 남은 시간이 이보다 적으면 새 페이지 묶음을 시작하지 않음 (다음 호출에서 이어서 진행)
+BACKFILL_TIME_MARGIN = float(os.environ.get('FRGN_BACKFILL_TIME_MARGIN', '15'))
+
+def _iso_date(text):
+    return text.strip().replace('.', '-')
+
+def build_history_item(symbol, date, net_buy):
+    return {
+        'PK': f'STOCK#{symbol}',
+        'SK': f'{HISTORY_SK_PREFIX}{date}',
+        'netBuy': int(net_buy),
+    }
+
+def append_new_rows(symbol, rows, writer, through=None):
+    """frgn 행 [{'date', 'net_buy'}] 중 through(마지막 저장 거래일)보다 새로운 행만 저장 → 가장 최근 거래일"""
+    latest = through
+    for row in rows:
+        if not row['date']:
+            continue
+        date = _iso_date(row['date'])
+        if through and date <= through:
+            continue
+        writer.put(build_history_item(symbol, date, row['net_buy']), tag=symbol)
+        latest = max(latest or date, date)
+    return latest
+
+def get_foreign_history(symbol, start_date=None, end_date=None, newest_first=True, limit=None):
+    """저장된 외국인 순매매 이력 조회 → [{'date', 'netBuy'}] (페이지네이션 포함)"""
+    items = query_range(f'STOCK#{symbol}', HISTORY_SK_PREFIX, start_date, end_date, ['netBuy'], newest_first, limit)
+    return [{'date': item['SK'][len(HISTORY_SK_PREFIX):], 'netBuy': int(item['netBuy'])} for item in items]
+
+def fetch_page(symbol, page):
+    """frgn 페이지 한 장의 행 목록 (실패 시 None)"""
+    try:
+        response = http_client.get(FRGN_URL.format(symbol=symbol, page=page))
+        response.raise_for_status()
+        return extractors.parse_foreigner_rows(response.text)
+    except Exception as e:
+        logger.error(f"[{symbol} {page}p] 외국인 데이터 오류: {e}")
+        return None
+
+def load_progress(symbols, resource=None):
+    """종목별 백필 진행 상태를 BatchGetItem으로 한 번에 조회 → {symbol: item}"""
+    found = _batch_get_items([(f'STOCK#{symbol}', PROGRESS_SK) for symbol in symbols], resource=resource)
+    return {pk[len('STOCK#'):]: item for (pk, _), item in found.items()}
+
+def backfill_symbol(engine, symbol, progress=None, max_pages=None, deadline=None, resource=None):
+    """frgn 페이지를 BACKFILL_WINDOW장씩 병렬로 받아 과거 방향으로 저장
+
+    페이지 묶음마다 이력 항목을 먼저 저장한 뒤 진행 상태(nextPage, oldestDate)를 기록하므로,
+    중간에 멈춰도 다음 실행은 마지막으로 저장이 끝난 페이지부터 이어서 진행한다.
+    """
+    max_pages = max_pages or BACKFILL_PAGES
+    progress = progress or {}
+    page = int(progress.get('nextPage', 1))
+    # complete는 이력 끝(상장일)에 도달한 경우만 기록하므로, 페이지 수를 늘리면 이어서 더 수집한다
+    if progress.get('complete') or page > max_pages:
+        return {'symbol': symbol, 'status': 'complete', 'page': page - 1, 'stored': 0}
+    oldest = progress.get('oldestDate')
+    complete = False
+    stored = 0
+    status = 'partial'
+    while page <= max_pages and not complete:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        pages = list(range(page, min(page + BACKFILL_WINDOW, max_pages + 1)))
+        fetched = engine.fan_out(*[lambda page=page: fetch_page(symbol, page) for page in pages])
+        writer = BatchWriter(resource=resource)
+        next_page = page
+        for rows in fetched:
+            if rows is None:
+                break
+            dates = [_iso_date(row['date']) for row in rows if row['date']]
+            rows = [row for row in rows if row['date'] and (oldest is None or _iso_date(row['date']) < oldest)]
+            # 마지막 페이지를 넘어가면 네이버는 빈 표나 마지막 페이지를 다시 돌려줌
+            if not dates or (not rows and min(dates) <= oldest):
+                complete = True
+                break
+            # 재개 사이에 새 거래일이 쌓여 이미 저장한 구간으로 밀려난 페이지는 건너뜀
+            next_page += 1
+            if not rows:
+                continue
+            for row in rows:
+                writer.put(build_history_item(symbol, _iso_date(row['date']), row['net_buy']), tag=symbol)
+            oldest = min(_iso_date(row['date']) for row in rows)
+            stored += len(rows)
+        writer.flush()
+        if writer.results.get(symbol) == 'failed':
+            status = 'failed'
+            break
+        if next_page == page and not complete:
+            status = 'failed'
+            break
+        page = next_page
+        state = {
+            'PK': f'STOCK#{symbol}',
+            'SK': PROGRESS_SK,
+            'nextPage': page,
+            'complete': complete,
+            'updatedAt': datetime.datetime.utcnow().isoformat() + 'Z',
+        }
+        if oldest:
+            state['oldestDate'] = oldest
+        writer.put(state)
+        writer.flush()
+    if complete or page > max_pages:
+        status = 'complete'
+    logger.info(f"[{symbol}] 외국인 순매매 백필: {stored}일 저장, 다음 페이지 {page} ({status})")
+    return {'symbol': symbol, 'status': status, 'page': page - 1, 'stored': stored}
+
+def backfill_main(event=None, context=None):
+    """외국인 순매매 이력 백필 Lambda: 종목들을 병렬로, 각 종목은 여러 페이지를 병렬로 수집"""
+    try:
+        symbols = event.get('symbols') if event else None
+        max_pages = event.get('pages') if event else None
+        restart = bool(event and event.get('restart'))
+        if not symbols:
+            from lambda_main import get_stocks_from_db
+            symbols = [symbol for symbol, _ in get_stocks_from_db()]
+        if not symbols:
+            logger.info("백필할 주식 목록이 없습니다.")
+            return {"statusCode": 200, "body": json.dumps([])}
+        progress = {} if restart else load_progress(symbols)
+        deadline = None
+        if context is not None:
+            deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000.0 - BACKFILL_TIME_MARGIN
+        items = [(symbol, progress.get(symbol)) for symbol in symbols]
+        results = crawl(lambda engine, symbol, state: backfill_symbol(engine, symbol, state, max_pages, deadline), items,
+                        event.get('maxInFlight') if event else None)
+        pending = [result['symbol'] for result in results if result['status'] != 'complete']
+        logger.info(f"외국인 순매매 백필: {len(symbols) - len(pending)}/{len(symbols)}종목 완료")
+        return {"statusCode": 200, "body": json.dumps({'results': results, 'pending': pending})}
+    except Exception as e:
+        logger.error(f"오류 발생: {e}")
+        return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+
+if __name__ == "__main__":
+    print(backfill_main({'symbols': sys.argv[1:]} if len(sys.argv) > 1 else None))
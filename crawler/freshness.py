@@ -0,0 +1,116 @@
+# crawler/freshness.py
+import os
+import time
+import datetime
+import threading
+import logging
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+# 필드별 갱신 주기: 시세는 매 실행, 외국인 매매는 하루 1회(공시 이후), 종목명은 캐시 미스 시에만(name_cache)
+KST = datetime.timezone(datetime.timedelta(hours=9))
+FOREIGN_FLOW_PUBLISH_HOUR = int(os.environ.get('FOREIGN_FLOW_PUBLISH_HOUR', '16'))
+# 받은 데이터에 필요한 거래일이 아직 없을 때(게시 지연, 평일 휴장일) 재확인 간격과 같은 거래일 기준 최대 확인 횟수
+FOREIGN_FLOW_RECHECK_MINUTES = float(os.environ.get('FOREIGN_FLOW_RECHECK_MINUTES', '30'))
+FOREIGN_FLOW_MAX_CHECKS = int(os.environ.get('FOREIGN_FLOW_MAX_CHECKS', '6'))
+STATE_SK = 'CRAWLSTATE'
+
+def foreign_flow_required_date(now=None):
+    """지금 시점에 게시되어 있어야 할 가장 최근 외국인 매매 거래일 (주말은 직전 금요일)"""
+    now = (now or datetime.datetime.now(KST)).astimezone(KST)
+    day = now.date() if now.hour >= FOREIGN_FLOW_PUBLISH_HOUR else now.date() - datetime.timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= datetime.timedelta(days=1)
+    return day.isoformat()
+
+class CrawlStateStore:
+    """종목별 크롤링 상태 (PK=STOCK#<symbol>, SK=CRAWLSTATE)
+
+    마지막으로 받은 외국인 순매매 배열과 그 최신 거래일을 보관해,
+    장중 실행에서는 frgn 페이지를 다시 받지 않고 저장된 배열을 재사용한다.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+
+    def load(self, symbols, resource=None):
+        """메모리에 없는 종목 상태를 BatchGetItem으로 한 번에 불러옴 (워밍된 인스턴스에서는 생략)"""
+        from db import _batch_get_items
+        with self._lock:
+            missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self._loaded]
+        if not missing:
+            return
+        try:
+            found = _batch_get_items([(f'STOCK#{symbol}', STATE_SK) for symbol in missing], resource=resource)
+        except (ClientError, RuntimeError) as e:
+            logger.warning(f"크롤링 상태 조회 오류: {e}")
+            return
+        with self._lock:
+            for (pk, _), item in found.items():
+                self._states[pk[len('STOCK#'):]] = item
+            self._loaded.update(missing)
+        logger.info(f"크롤링 상태 로드: {len(found)}/{len(missing)}종목")
+
+    def foreign_flow_due(self, symbol, required_date=None):
+        """외국인 매매 데이터를 새로 받아야 하는지 여부
+
+        받은 데이터의 최신 거래일이 필요한 거래일보다 오래됐으면 계속 대상이지만,
+        같은 필요 거래일에 대해서는 재확인 간격마다 최대 횟수까지만 다시 받는다 (평일 휴장일 대비).
+        """
+        required_date = required_date or foreign_flow_required_date()
+        with self._lock:
+            state = self._states.get(symbol)
+        fetched_for = state.get('foreignFetchedFor') if state else None
+        if not fetched_for:
+            return True
+        if fetched_for >= required_date:
+            return False
+        if state.get('foreignCheckedFor') != required_date:
+            return True
+        if int(state.get('foreignChecks', 0)) >= FOREIGN_FLOW_MAX_CHECKS:
+            return False
+        return time.time() - float(state.get('foreignCheckedAt', 0)) >= FOREIGN_FLOW_RECHECK_MINUTES * 60
+
+    def history_through(self, symbol):
+        """외국인 순매매 이력(FRGN#)에 마지막으로 저장한 거래일 (모르면 None)"""
+        with self._lock:
+            state = self._states.get(symbol)
+        return state.get('foreignHistoryThrough') if state else None
+
+    def resolve_foreign_flow(self, symbol, fetched, writer=None, required_date=None, history_through=None):
+        """새로 받은 (순매매, 날짜) 배열이 있으면 상태에 기록하고, 없으면 저장된 배열을 반환
+
+        foreignFetchedFor에는 받은 배열의 최신 거래일을 기록한다 (필요한 거래일이 아직 게시되지 않았으면 그 이전 날짜).
+        """
+        if fetched is not None and any(fetched[1]):
+            required_date = required_date or foreign_flow_required_date()
+            with self._lock:
+                previous = self._states.get(symbol) or {}
+            checks = int(previous.get('foreignChecks', 0)) + 1 if previous.get('foreignCheckedFor') == required_date else 1
+            state = {
+                'PK': f'STOCK#{symbol}',
+                'SK': STATE_SK,
+                'symbol': symbol,
+                'foreignerNetBuy': list(fetched[0]),
+                'foreignerNetBuyDate': list(fetched[1]),
+                'foreignFetchedFor': max(date for date in fetched[1] if date),
+                'foreignCheckedFor': required_date,
+                'foreignChecks': checks,
+                'foreignCheckedAt': int(time.time()),
+                'updatedAt': datetime.datetime.utcnow().isoformat() + 'Z',
+            }
+            if history_through:
+                state['foreignHistoryThrough'] = history_through
+            with self._lock:
+                self._states[symbol] = state
+            if writer is not None:
+                writer.put(dict(state))
+            return fetched
+        with self._lock:
+            state = self._states.get(symbol)
+        if state:
+            return [int(x) for x in state['foreignerNetBuy']], list(state['foreignerNetBuyDate'])
+        return fetched
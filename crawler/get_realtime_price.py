@@ -1,57 +1,89 @@
-import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'python_libs'))
+import vendor_path
 
-import requests
 import json
 import re
+import polling_api
+from quote_cache import QuoteCache
+
+# 한 번의 호출에서 허용하는 최대 종목 수
+MAX_SYMBOLS = int(os.environ.get('REALTIME_MAX_SYMBOLS', '200'))
+SYMBOL_PATTERN = re.compile(r'^[0-9A-Za-z]{1,12}$')
+
+# 워밍된 인스턴스에서 유지되는 시세 캐시 (동시 미스는 업스트림 요청 1건으로 병합)
+_quote_cache = QuoteCache()
+
+def _parse_quote(stock_data):
+    return {
+        'price': stock_data['nv'], # 현재가
+        'change': stock_data['cv'], # 전일대비
+        'changeRate': stock_data['cr']  # 등락률
+    }
+
+def get_realtime_prices(symbols):
+    """여러 종목의 실시간 시세를 묶음 폴링 요청으로 가져와 {종목코드: 시세} 형태로 반환합니다."""
+    datas, errors = polling_api.fetch_chunked('SERVICE_ITEM', symbols)
+    prices = {}
+    for symbol in dict.fromkeys(symbols):
+        if symbol not in datas:
+            prices[symbol] = {"error": errors.get(symbol, "시세 데이터가 없습니다.")}
+            continue
+        try:
+            prices[symbol] = _parse_quote(datas[symbol])
+        except KeyError as e:
+            prices[symbol] = {"error": f"시세 데이터 형식 오류: {e}"}
+    return prices
 
 def get_realtime_price(symbol):
     """네이버 금융의 내부 API를 호출하여 실시간 시세를 가져옵니다."""
-    url = f"https://polling.finance.naver.com/api/realtime?query=SERVICE_ITEM:{symbol}"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Referer': f'https://finance.naver.com/item/sise.naver?code={symbol}'
-    }
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        # API 응답이 순수 JSON이므로, 바로 파싱합니다.
-        data = response.json()
-        stock_data = data['result']['areas'][0]['datas'][0]
-        
-        return {
-            'price': stock_data['nv'], # 현재가
-            'change': stock_data['cv'], # 전일대비
-            'changeRate': stock_data['cr']  # 등락률
-        }
+    return get_realtime_prices([symbol])[symbol]
 
-    except (requests.exceptions.RequestException, json.JSONDecodeError, KeyError, IndexError) as e:
-        return {"error": str(e)}
+def _parse_symbols(params):
+    """symbols=a,b,c 또는 symbol=a 파라미터를 검증된 종목 코드 목록으로 변환"""
+    raw = params.get('symbols') or params.get('symbol') or ''
+    return list(dict.fromkeys(s.strip() for s in raw.split(',') if s.strip()))
 
 def main(event, context):
-    """Lambda 핸들러"""
-    symbol = event.get('queryStringParameters', {}).get('symbol')
-    if not symbol:
+    """Lambda 핸들러 (symbol: 단일 종목, symbols: 콤마로 구분된 여러 종목)"""
+    params = (event or {}).get('queryStringParameters') or {}
+    symbols = _parse_symbols(params)
+    if not symbols:
         return {
             'statusCode': 400,
             'body': json.dumps({'error': 'Symbol parameter is required'})
         }
-    
-    price_data = get_realtime_price(symbol)
-    
-    if 'error' in price_data:
+    if len(symbols) > MAX_SYMBOLS or not all(SYMBOL_PATTERN.match(s) for s in symbols):
+        return {
+            'statusCode': 400,
+            'body': json.dumps({'error': f'Invalid symbols (max {MAX_SYMBOLS})'})
+        }
+
+    price_data, cache_stats = _quote_cache.get_many(symbols, get_realtime_prices)
+    _quote_cache.log_stats()
+    cache_headers = {
+        'X-Cache-Hits': str(cache_stats['hits']),
+        'X-Cache-Misses': str(cache_stats['misses']),
+        'X-Cache-Coalesced': str(cache_stats['coalesced']),
+    }
+    if 'symbols' in params:
+        failed = all('error' in quote for quote in price_data.values())
+    else:
+        price_data = price_data[symbols[0]]
+        failed = 'error' in price_data
+
+    if failed:
         return {
             'statusCode': 500,
+            'headers': cache_headers,
             'body': json.dumps(price_data)
         }
-        
+
     return {
         'statusCode': 200,
         'headers': {
             'Access-Control-Allow-Origin': '*', # CORS 허용
             'Access-Control-Allow-Credentials': True,
+            **cache_headers,
         },
         'body': json.dumps(price_data)
     }
@@ -0,0 +1,269 @@
+# crawler/gsi_migration.py
+"""GSI 쓰기 증폭 축소 마이그레이션 도구
+
+fiflow-users의 GSI 4개는 모두 ALL 프로젝션이라 MarketData/IndexData를 쓸 때마다 항목 전체가
+market-data-index / index-data-index에 한 번 더 기록된다. db.py 조회는 이미 기본 테이블 키(PK/SK)로
+옮겼으므로(READ_VIA_GSI=0), 이 도구로 남은 단계를 진행한다.
+
+  report   기본 테이블(또는 로컬 내보내기 파일)을 스캔해 항목 크기로 WCU 전/후를 추정
+  plan     GSI 생성 UpdateTable 요청 출력 (--apply 시 순서대로 실행하고 ACTIVE까지 대기)
+           --delete-old: 기존 GSI 삭제 요청 (API 서버 EMAIL_INDEX/KAKAO_ID_INDEX를 새 인덱스로 배포한 뒤 실행)
+  cleanup  MarketData/IndexData 항목에서 GSI 키 속성 제거 (--apply 없으면 건수만 집계)
+           시세 GSI 삭제 뒤에 실행하면 인덱스 쪽 삭제 쓰기 없이 저장 공간만 줄어듦
+  backfill cleanup의 반대: 빠진 GSI 키 속성을 다시 채움 (롤백 또는 KEYS_ONLY 인덱스 유지 시)
+
+새로 쓰는 항목은 WRITE_GSI_KEYS=0으로 GSI 키 속성을 빼고 저장한다.
+
+사용법: python gsi_migration.py report [--export items.json] [--segments N] [--keep-data-indexes]
+        python gsi_migration.py plan [--keep-data-indexes] [--delete-old] [--apply]
+        python gsi_migration.py cleanup|backfill [--segments N] [--apply]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), 'python_libs'))
+
+from botocore.exceptions import ClientError
+import item_size
+from db import TABLE_NAME, READ_VIA_GSI, get_resource
+
+# 로그인 조회(getUserByEmail / getUserByKakaoId)가 읽는 프로필 속성
+USER_PROFILE_ATTRS = ['kakaoId', 'email', 'nickname', 'loginType', 'isActive', 'lastLoginAt', 'createdAt', 'updatedAt']
+
+# 시세 GSI: 기본 테이블 키로 조회하므로 삭제 (--keep-data-indexes이면 KEYS_ONLY로 유지)
+# 사용자 GSI: 로그인에 필요하므로 유지하되 프로필 속성만 INCLUDE
+DATA_INDEXES = {
+    'market-data-index': {'sk_prefix': 'MARKETDATA#', 'key': 'symbol_date', 'parts': ('symbol', 'date')},
+    'index-data-index': {'sk_prefix': 'DATA#', 'key': 'index_name_date', 'parts': ('name', 'date')},
+}
+# 그대로 유지하는 GSI: 관심 종목 스캔용 userId 희소 인덱스 (없으면 plan에서 생성)
+KEPT_INDEXES = ('userId-index',)
+INCLUDE_INDEXES = {
+    'email-index': {'key': 'email', 'replacement': 'email-include-index'},
+    'kakaoId-index': {'key': 'kakaoId', 'replacement': 'kakaoId-include-index'},
+}
+
+def planned_indexes(keep_data_indexes=False):
+    """마이그레이션 후 GSI 구성 (item_size.TABLE_INDEXES 형식)"""
+    indexes = {name: item_size.TABLE_INDEXES[name] for name in KEPT_INDEXES}
+    for name, index in INCLUDE_INDEXES.items():
+        indexes[index['replacement']] = {'key': index['key'], 'projection': 'INCLUDE', 'include': USER_PROFILE_ATTRS}
+    if keep_data_indexes:
+        for name, index in DATA_INDEXES.items():
+            indexes[f'{name}-keys'] = {'key': index['key'], 'projection': 'KEYS_ONLY'}
+    return indexes
+
+def update_table_requests(keep_data_indexes=False, delete_old=False):
+    """UpdateTable 요청 목록 (GSI 생성/삭제는 요청 하나에 하나씩만 가능)
+
+    프로젝션은 기존 GSI에서 바꿀 수 없으므로 새 이름으로 만든 뒤 조회 경로를 옮기고 기존 GSI를 삭제한다.
+    생성과 삭제 사이에 API 서버 배포가 필요하므로 delete_old일 때만 삭제 요청을 반환한다.
+    """
+    if delete_old:
+        return [{'TableName': TABLE_NAME, 'GlobalSecondaryIndexUpdates': [{'Delete': {'IndexName': name}}]}
+                for name in [*INCLUDE_INDEXES, *DATA_INDEXES]]
+    requests = []
+    for name, index in planned_indexes(keep_data_indexes).items():
+        projection = {'ProjectionType': index['projection']}
+        if index['projection'] == 'INCLUDE':
+            projection['NonKeyAttributes'] = index['include']
+        requests.append({
+            'TableName': TABLE_NAME,
+            'AttributeDefinitions': [{'AttributeName': index['key'], 'AttributeType': 'S'}],
+            'GlobalSecondaryIndexUpdates': [{'Create': {
+                'IndexName': name,
+                'KeySchema': [{'AttributeName': index['key'], 'KeyType': 'HASH'}],
+                'Projection': projection,
+            }}],
+        })
+    return requests
+
+def _wait_until_active(client, poll=15):
+    while True:
+        table = client.describe_table(TableName=TABLE_NAME)['Table']
+        busy = [index['IndexName'] for index in table.get('GlobalSecondaryIndexes', []) if index['IndexStatus'] != 'ACTIVE']
+        if table['TableStatus'] == 'ACTIVE' and not busy:
+            return
+        print(f"  대기 중: 테이블 {table['TableStatus']}, 인덱스 {busy}")
+        time.sleep(poll)
+
+def run_plan(keep_data_indexes=False, apply=False, delete_old=False):
+    requests = update_table_requests(keep_data_indexes, delete_old)
+    replacements = ', '.join(index['replacement'] for index in INCLUDE_INDEXES.values())
+    if not apply:
+        print(json.dumps(requests, indent=2, ensure_ascii=False))
+        if delete_old:
+            print(f"\n# dry-run: UpdateTable {len(requests)}건. API 서버가 EMAIL_INDEX/KAKAO_ID_INDEX로 {replacements}를 쓰는지 확인 후 적용하세요.")
+        else:
+            print(f"\n# dry-run: UpdateTable {len(requests)}건. 생성 후 API 서버 EMAIL_INDEX/KAKAO_ID_INDEX 환경 변수를"
+                  f" {replacements}로 배포하고 plan --delete-old로 기존 GSI를 삭제하세요.")
+        return
+    if delete_old and READ_VIA_GSI:
+        # 크롤러 조회가 아직 시세 GSI를 쓰는 설정이면 삭제하지 않음 (API 서버 조회는 기본 테이블 키 Query)
+        sys.exit("READ_VIA_GSI=1: market-data-index / index-data-index 조회가 남아 있어 적용하지 않습니다.")
+    client = get_resource().meta.client
+    indexes = client.describe_table(TableName=TABLE_NAME)['Table'].get('GlobalSecondaryIndexes', [])
+    existing = {index['IndexName'] for index in indexes}
+    if delete_old:
+        # 대체 인덱스가 ACTIVE가 아니면 로그인 조회가 옮겨갈 곳이 없으므로 삭제하지 않음
+        active = {index['IndexName'] for index in indexes if index['IndexStatus'] == 'ACTIVE'}
+        missing = [index['replacement'] for index in INCLUDE_INDEXES.values() if index['replacement'] not in active]
+        if missing:
+            sys.exit(f"대체 GSI가 ACTIVE가 아닙니다: {', '.join(missing)} (plan --apply 먼저 실행)")
+    for request in requests:
+        update = request['GlobalSecondaryIndexUpdates'][0]
+        action, name = next(iter(update.items()))
+        name = name['IndexName']
+        if (action == 'Create') == (name in existing):
+            print(f"건너뜀: {action} {name}")
+            continue
+        print(f"UpdateTable: {action} {name}")
+        client.update_table(**request)
+        _wait_until_active(client)
+    if not delete_old:
+        print(f"생성 완료. API 서버 EMAIL_INDEX/KAKAO_ID_INDEX를 {replacements}로 배포한 뒤 plan --delete-old --apply로 기존 GSI를 삭제하세요.")
+
+def scan_items(segments=1, projection=None, filter_expression=None, names=None, values=None):
+    """기본 테이블 병렬 세그먼트 스캔 → 항목 목록 (페이지네이션)"""
+    table = get_resource().Table(TABLE_NAME)
+
+    def scan_segment(segment):
+        kwargs = {}
+        if segments > 1:
+            kwargs.update(Segment=segment, TotalSegments=segments)
+        if projection:
+            kwargs['ProjectionExpression'] = projection
+        if filter_expression:
+            kwargs['FilterExpression'] = filter_expression
+        if names:
+            kwargs['ExpressionAttributeNames'] = names
+        if values:
+            kwargs['ExpressionAttributeValues'] = values
+        items = []
+        while True:
+            response = table.scan(**kwargs)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return items
+            kwargs['ExclusiveStartKey'] = last_key
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        return [item for items in executor.map(scan_segment, range(segments)) for item in items]
+
+def load_export(path):
+    """로컬 내보내기 파일 (항목 JSON 배열 또는 JSON Lines) → 항목 목록"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def item_kind(item):
+    sk = item.get('SK', '')
+    for prefix, kind in (('MARKETDATA#', 'MarketData'), ('DATA#', 'IndexData'), ('FRGN#', 'ForeignHistory'), ('STOCK#', 'Stock')):
+        if sk.startswith(prefix):
+            return kind
+    return {'PROFILE': 'Profile', 'LATEST': 'Latest', 'WATCHLIST_SNAPSHOT': 'Snapshot'}.get(sk, 'Other')
+
+def _migrated(item, keep_data_indexes):
+    # cleanup 이후 모습: 시세 GSI를 삭제하면 키 속성도 제거
+    if keep_data_indexes:
+        return item
+    return {name: value for name, value in item.items() if name not in ('symbol_date', 'index_name_date')}
+
+def cost_report(items, keep_data_indexes=False):
+    """항목 종류별 크기와 (모든 항목을 한 번씩 쓸 때의) WCU 전/후 → 행 목록"""
+    after_indexes = planned_indexes(keep_data_indexes)
+    rows = {}
+    for item in items:
+        row = rows.setdefault(item_kind(item), {'count': 0, 'bytes': 0, 'before': 0, 'after': 0, 'gsi_before': 0, 'gsi_after': 0})
+        migrated = _migrated(item, keep_data_indexes)
+        row['count'] += 1
+        row['bytes'] += item_size.item_size(item)
+        row['before'] += item_size.total_write_units(item)
+        row['after'] += item_size.total_write_units(migrated, after_indexes)
+        row['gsi_before'] += item_size.replicated_bytes(item)
+        row['gsi_after'] += item_size.replicated_bytes(migrated, after_indexes)
+    return rows
+
+def print_report(rows):
+    # WCU는 1KB 단위 올림이므로 작은 항목은 프로젝션을 줄여도 그대로일 수 있음 → GSI 저장량도 함께 표시
+    print(f"{'kind':<16}{'items':>8}{'avg bytes':>11}{'WCU before':>12}{'WCU after':>11}{'saved':>8}{'GSI KB before':>15}{'GSI KB after':>14}")
+    total = {'count': 0, 'before': 0, 'after': 0, 'gsi_before': 0, 'gsi_after': 0}
+    for kind, row in sorted(rows.items(), key=lambda entry: -entry[1]['before']):
+        saved = 1 - row['after'] / row['before'] if row['before'] else 0
+        print(f"{kind:<16}{row['count']:>8}{row['bytes'] / row['count']:>11.0f}{row['before']:>12}{row['after']:>11}{saved:>8.0%}"
+              f"{row['gsi_before'] / 1024:>15.1f}{row['gsi_after'] / 1024:>14.1f}")
+        for key in total:
+            total[key] += row[key]
+    if total['before']:
+        print(f"{'total':<16}{total['count']:>8}{'':>11}{total['before']:>12}{total['after']:>11}{1 - total['after'] / total['before']:>8.0%}"
+              f"{total['gsi_before'] / 1024:>15.1f}{total['gsi_after'] / 1024:>14.1f}")
+
+def run_attribute_migration(mode, segments=1, apply=False):
+    """cleanup: GSI 키 속성 제거 / backfill: 빠진 GSI 키 속성 채움 (조건부 UpdateItem, 멱등)"""
+    table = get_resource().Table(TABLE_NAME)
+    counts = {}
+    for index_name, index in DATA_INDEXES.items():
+        condition = 'attribute_exists' if mode == 'cleanup' else 'attribute_not_exists'
+        items = scan_items(
+            segments,
+            projection='PK, SK, #a, #b',
+            filter_expression=f'begins_with(SK, :prefix) AND {condition}(#key)',
+            names={'#key': index['key'], '#a': index['parts'][0], '#b': index['parts'][1]},
+            values={':prefix': index['sk_prefix']},
+        )
+        counts[index_name] = {'matched': len(items), 'updated': 0, 'failed': 0}
+        if not apply:
+            continue
+
+        def update(item, index=index):
+            key = {'PK': item['PK'], 'SK': item['SK']}
+            if mode == 'cleanup':
+                kwargs = {'UpdateExpression': 'REMOVE #key', 'ConditionExpression': 'attribute_exists(PK)'}
+            else:
+                kwargs = {
+                    'UpdateExpression': 'SET #key = :value',
+                    'ConditionExpression': 'attribute_exists(PK) AND attribute_not_exists(#key)',
+                    'ExpressionAttributeValues': {':value': f"{item[index['parts'][0]]}_{item[index['parts'][1]]}"},
+                }
+            try:
+                table.update_item(Key=key, ExpressionAttributeNames={'#key': index['key']}, **kwargs)
+                return True
+            except ClientError as e:
+                print(f"{mode} 오류 {key}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max(1, segments) * 4) as executor:
+            for ok in executor.map(update, items):
+                counts[index_name]['updated' if ok else 'failed'] += 1
+    for index_name, count in counts.items():
+        print(f"{mode} {index_name}: 대상 {count['matched']}건, 갱신 {count['updated']}건, 실패 {count['failed']}건"
+              + ('' if apply else ' (dry-run)'))
+    return counts
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='GSI 쓰기 증폭 축소 마이그레이션')
+    parser.add_argument('command', choices=['report', 'plan', 'cleanup', 'backfill'])
+    parser.add_argument('--export', help='report: 테이블 대신 읽을 로컬 항목 파일 (JSON 배열 / JSON Lines)')
+    parser.add_argument('--segments', type=int, default=4, help='병렬 스캔 세그먼트 수')
+    parser.add_argument('--keep-data-indexes', action='store_true', help='시세 GSI를 삭제하지 않고 KEYS_ONLY로 유지')
+    parser.add_argument('--delete-old', action='store_true', help='plan: 생성 대신 기존 GSI 삭제 (API 서버 배포 후)')
+    parser.add_argument('--apply', action='store_true', help='실제로 변경 (기본은 dry-run)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'report':
+        items = load_export(args.export) if args.export else scan_items(args.segments)
+        print(f"{len(items)}개 항목, 변경 후 GSI: {', '.join(planned_indexes(args.keep_data_indexes))}")
+        print_report(cost_report(items, args.keep_data_indexes))
+    elif args.command == 'plan':
+        run_plan(args.keep_data_indexes, args.apply, args.delete_old)
+    else:
+        run_attribute_migration(args.command, args.segments, args.apply)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
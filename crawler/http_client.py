@@ -0,0 +1,50 @@
+# crawler/http_client.py
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from crawl_engine import host_slot, MAX_IN_FLIGHT, MAX_PER_HOST
+
+# 공통 요청 헤더 (모든 크롤러 모듈에서 공유)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8',
+    'Connection': 'keep-alive',
+}
+
+# 연결/읽기 타임아웃 (초)
+CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '10'))
+
+# 커넥션 풀 크기: 호스트 수(finance/polling.finance 등) x 호스트당 커넥션 수
+POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', '4'))
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', str(max(MAX_IN_FLIGHT, MAX_PER_HOST))))
+
+_session = None
+_session_lock = threading.Lock()
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # 연결 단계 오류만 재시도 (읽기/상태 코드 재시도는 호출부 정책을 따름)
+    retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_session():
+    """모듈 전역 세션 반환 (워밍된 Lambda 호출 간 keep-alive 커넥션 재사용)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def get(url, headers=None, timeout=None, **kwargs):
+    """공유 세션으로 GET 요청 (호스트별 동시 요청 수 제한 적용)"""
+    with host_slot(url):
+        return get_session().get(url, headers=headers, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT), **kwargs)
@@ -1,63 +1,76 @@
 # crawler/index_crawler.py
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'python_libs'))
+import vendor_path
 
-import requests
 import datetime
 import json
 import logging
-from botocore.exceptions import ClientError
-from db import create_index_data
+from db import BatchWriter
+from records import IndexDataRecord
+import polling_api
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_INDICES = ['KOSPI', 'KOSDAQ', 'KPI200']
+MAX_ATTEMPTS = 3
+
+def _to_index_data(item):
+    return {
+        'name': item['cd'],
+        'value': float(item['nv'] / 100.0),
+        'change': float(item['cv'] / 100.0),
+        'changeRate': float(item['cr'])  # Number
+    }
+
+def get_indices_data(names):
+    """네이버 금융에서 여러 지수 데이터를 최소한의 폴링 요청(SERVICE_INDEX:a,b,c)으로 크롤링 → {지수명: 데이터}"""
+    remaining = list(dict.fromkeys(name.upper() for name in names))
+    indices = {}
+    for attempt in range(MAX_ATTEMPTS):  # 3회 재시도 (요청 자체가 실패한 지수만)
+        datas, errors = polling_api.fetch_chunked('SERVICE_INDEX', remaining)
+        for name in remaining:
+            if name in datas:
+                try:
+                    indices[name] = _to_index_data(datas[name])
+                except (KeyError, TypeError) as e:
+                    logger.error(f"[{name}] 지수 데이터 형식 오류: {e}")
+            elif name not in errors:
+                logger.warning(f"[{name}] 지수 데이터 없음")
+        remaining = [name for name in remaining if name in errors]
+        if not remaining:
+            break
+        logger.error(f"[{','.join(remaining)}] 크롤링 오류 (시도 {attempt+1}/{MAX_ATTEMPTS})")
+    return indices
+
 def get_index_data(name):
     """네이버 금융에서 지수 데이터 크롤링"""
-    url = "https://polling.finance.naver.com/api/realtime?query=SERVICE_INDEX:KOSPI,KOSDAQ,KPI200"
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124'}
-    for attempt in range(3):  # 3회 재시도
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            for area in data['result']['areas']:
-                if area['name'] == 'SERVICE_INDEX':
-                    for item in area['datas']:
-                        if item['cd'] == name.upper():
-                            return {
-                                'name': item['cd'],
-                                'value': float(item['nv'] / 100.0),
-                                'change': float(item['cv'] / 100.0),
-                                'changeRate': float(item['cr'])  # Number
-                            }
-            logger.warning(f"[{name}] 지수 데이터 없음")
-            return None
-        except (requests.exceptions.RequestException, json.JSONDecodeError, KeyError, TypeError) as e:
-            logger.error(f"[{name}] 크롤링 오류 (시도 {attempt+1}/3): {e}")
-            if attempt == 2:
-                return None
-    return None
+    return get_indices_data([name]).get(name.upper())
 
 def main(event=None, context=None):
     """Lambda 핸들러: 지수 데이터 크롤링 및 저장"""
     try:
-        indices = event.get('indices', ['KOSPI', 'KOSDAQ', 'KPI200']) if event else ['KOSPI', 'KOSDAQ', 'KPI200']
+        indices = event.get('indices', DEFAULT_INDICES) if event else DEFAULT_INDICES
         date = datetime.date.today().isoformat()
+        logger.info(f"[{','.join(indices)}] 지수 크롤링 시작...")
+        crawled = get_indices_data(indices)
         results = []
-        for name in indices:
-            logger.info(f"[{name}] 지수 크롤링 시작...")
-            index_data = get_index_data(name)
-            if index_data:
-                index_data['date'] = date
-                logger.info(f"크롤링 데이터: {index_data}")
-                create_index_data(index_data)
-                results.append({"name": name, "status": "success"})
-            else:
-                logger.error(f"[{name}] 크롤링 실패")
-                results.append({"name": name, "status": "failed"})
+        # 모든 IndexData 항목을 한 번의 BatchWriteItem으로 저장
+        with BatchWriter(elide=True) as writer:
+            for name in indices:
+                index_data = crawled.get(name.upper())
+                if index_data:
+                    index_data['date'] = date
+                    logger.info(f"크롤링 데이터: {index_data}")
+                    writer.put(IndexDataRecord.from_dict(index_data), tag=name)
+                    results.append({"name": name, "status": "success"})
+                else:
+                    logger.error(f"[{name}] 크롤링 실패")
+                    results.append({"name": name, "status": "failed"})
+        for result in results:
+            if result['status'] == 'success':
+                result['status'] = writer.results.get(result['name'], 'failed')
+        logger.info(f"변경 없는 항목 쓰기 생략: {writer.elided}건")
         return {"statusCode": 200, "body": json.dumps(results)}
     except Exception as e:
         logger.error(f"오류 발생: {e}")
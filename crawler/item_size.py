@@ -0,0 +1,85 @@
+# crawler/item_size.py
+import math
+from decimal import Decimal
+
+# DynamoDB 항목 크기 / 용량 단위 계산 (AWS 문서의 크기 규칙 기준 근사치)
+#   문자열: UTF-8 바이트, 숫자: 유효 숫자 2개당 1바이트 + 1바이트, 바이너리: 바이트 수,
+#   Boolean/Null: 1바이트, List/Map: 3바이트 + 요소당 1바이트 + 요소 크기, 속성 이름은 UTF-8 바이트
+WRITE_UNIT_BYTES = 1024
+READ_UNIT_BYTES = 4096
+
+# GSI 복제본마다 붙는 인덱스 항목 오버헤드
+INDEX_ITEM_OVERHEAD = 100
+BASE_KEY_ATTRS = ('PK', 'SK')
+
+# fiflow-users 테이블 GSI (fiflow_dynamo.json과 동일, 키 속성이 있는 항목만 인덱스에 복제됨)
+TABLE_INDEXES = {
+    'email-index': {'key': 'email', 'projection': 'ALL'},
+    'kakaoId-index': {'key': 'kakaoId', 'projection': 'ALL'},
+    'market-data-index': {'key': 'symbol_date', 'projection': 'ALL'},
+    'index-data-index': {'key': 'index_name_date', 'projection': 'ALL'},
+    'userId-index': {'key': 'userId', 'projection': 'INCLUDE', 'include': ['symbol', 'stockName', 'name']},
+}
+
+def _number_size(value):
+    digits = Decimal(str(value)).normalize().as_tuple().digits
+    significant = len(digits) if any(digits) else 1
+    return min(21, (significant + 1) // 2 + 1)
+
+def value_size(value):
+    """속성 값 하나의 크기 (바이트)"""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (int, float, Decimal)):
+        return _number_size(value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, 'value') and isinstance(value.value, (bytes, bytearray)):
+        return len(value.value)  # boto3 Binary
+    if isinstance(value, dict):
+        return 3 + sum(len(k.encode('utf-8')) + value_size(v) + 1 for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return 3 + sum(value_size(v) + 1 for v in value)
+    raise TypeError(f"크기를 계산할 수 없는 값: {type(value).__name__}")
+
+def item_size(item):
+    """항목 전체 크기 (속성 이름 + 값, 바이트)"""
+    return sum(len(name.encode('utf-8')) + value_size(value) for name, value in item.items())
+
+def write_units(item):
+    """PutItem 1회의 WCU (1KB 단위 올림)"""
+    return max(1, math.ceil(item_size(item) / WRITE_UNIT_BYTES))
+
+def read_units(size, consistent=False):
+    """읽은 바이트 합계에 대한 RCU (4KB 단위 올림, 최종 일관성은 절반)"""
+    units = max(1, math.ceil(size / READ_UNIT_BYTES))
+    return units if consistent else units / 2
+
+def replicated_indexes(item, indexes=None):
+    """항목이 복제되는 GSI 이름 목록"""
+    return [name for name, index in (TABLE_INDEXES if indexes is None else indexes).items() if item.get(index['key']) is not None]
+
+def index_item_size(item, index):
+    """GSI 복제본 크기: 기본 테이블 키 + 인덱스 키 + 프로젝션 속성 + 오버헤드"""
+    projection = index.get('projection', 'ALL')
+    if projection == 'ALL':
+        return item_size(item) + INDEX_ITEM_OVERHEAD
+    names = {*BASE_KEY_ATTRS, index['key']}
+    if projection == 'INCLUDE':
+        names.update(index.get('include', ()))
+    return item_size({name: value for name, value in item.items() if name in names}) + INDEX_ITEM_OVERHEAD
+
+def replicated_bytes(item, indexes=None):
+    """항목이 GSI에 복제되며 차지하는 크기 합계 (바이트)"""
+    indexes = TABLE_INDEXES if indexes is None else indexes
+    return sum(index_item_size(item, indexes[name]) for name in replicated_indexes(item, indexes))
+
+def total_write_units(item, indexes=None):
+    """기본 테이블 + 복제되는 GSI 쓰기까지 포함한 WCU"""
+    indexes = TABLE_INDEXES if indexes is None else indexes
+    units = write_units(item)
+    for name in replicated_indexes(item, indexes):
+        units += max(1, math.ceil(index_item_size(item, indexes[name]) / WRITE_UNIT_BYTES))
+    return units
@@ -1,79 +1,183 @@
-import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'python_libs'))
+import vendor_path
 
-import requests
-from bs4 import BeautifulSoup
 import datetime
-import re
-import boto3
 from botocore.exceptions import ClientError
 import logging
 import json
 import traceback
-from db import create_market_data
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from db import TABLE_NAME, create_market_data, create_latest_market_data, build_latest_market_data_item, BatchWriter
+from records import MarketDataRecord
+from crawl_engine import crawl
+import http_client
+import aws_clients
+import extractors
+import name_cache
+from market_listing import get_market_listings
+import polling_api
+from freshness import CrawlStateStore
+from foreign_history import append_new_rows
+from watchlist_snapshot import SnapshotBuilder
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_stocks_from_db():
-    """DynamoDB에서 주식 목록 조회"""
+# 시세 수집 모드: polling (폴링 API 묶음 요청) | market (시가총액 목록 일괄 수집) | symbol (종목별 sise 페이지)
+# polling/market 모드에서도 일괄 수집에서 빠진 종목은 sise 페이지로 대체 수집
+CRAWL_MODE = os.environ.get('CRAWL_MODE', 'polling')
+
+# 필드별 갱신 주기 적용 여부 (외국인 매매는 하루 1회, 상태는 워밍된 인스턴스에서 유지)
+FRESHNESS_ENABLED = os.environ.get('FRESHNESS_ENABLED', '1') == '1'
+_crawl_states = CrawlStateStore()
+
+# 일일 크롤링에서 외국인 순매매 이력(STOCK#<symbol> / FRGN#<date>)에 새 거래일 추가 여부
+FOREIGN_HISTORY_ENABLED = os.environ.get('FOREIGN_HISTORY_ENABLED', '1') == '1'
+
+# 사용자별 관심 종목 스냅샷(USER#<id> / WATCHLIST_SNAPSHOT) 유지 여부
+SNAPSHOT_ENABLED = os.environ.get('WATCHLIST_SNAPSHOT_ENABLED', '1') == '1'
+_snapshots = SnapshotBuilder()
+
+# 관심 종목 스캔 병렬 세그먼트 수 (1이면 순차 스캔)
+WATCHLIST_SCAN_SEGMENTS = int(os.environ.get('WATCHLIST_SCAN_SEGMENTS', '1'))
+# 사용자 STOCK# 항목에만 있는 userId를 키로 하는 희소 GSI (빈 값이면 기본 테이블 스캔)
+WATCHLIST_INDEX = os.environ.get('WATCHLIST_INDEX', 'userId-index')
+
+def _string_attr(item, name):
+    # 저수준 client 응답 항목(AttributeValue 형식)의 문자열 속성 값
+    return item.get(name, {}).get('S')
+
+def _scan_watchlist_segment(client, segment, total_segments, index_name=None):
+    """사용자 STOCK# 항목을 페이지 단위로 끝까지 스캔 (사용자 PK/symbol/종목명만 프로젝션)
+
+    index_name이 있으면 userId 희소 GSI를 스캔해 시세/상태/스냅샷 항목은 읽지 않는다.
+    client는 저수준 DynamoDB client이므로 조건 값과 반환 항목 모두 AttributeValue 형식이다.
+    """
+    kwargs = {
+        'TableName': TABLE_NAME,
+        'FilterExpression': 'begins_with(SK, :sk)',
+        'ProjectionExpression': 'PK, symbol, stockName, #nm',
+        'ExpressionAttributeNames': {'#nm': 'name'},
+        'ExpressionAttributeValues': {':sk': {'S': 'STOCK#'}},
+    }
+    if index_name:
+        kwargs['IndexName'] = index_name
+    if total_segments > 1:
+        kwargs.update(Segment=segment, TotalSegments=total_segments)
+    items = []
+    while True:
+        response = client.scan(**kwargs)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return items
+        kwargs['ExclusiveStartKey'] = last_key
+
+def get_watchlists_from_db(total_segments=None):
+    """DynamoDB에서 사용자별 관심 종목 조회 → {USER#<id>: [(symbol, 종목명)]} (페이지네이션)"""
+    total_segments = max(1, int(total_segments or WATCHLIST_SCAN_SEGMENTS))
+    # 공유 저수준 클라이언트는 스레드 간 공유 가능
+    client = aws_clients.get_client('dynamodb')
+
+    def scan(index_name):
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            return list(executor.map(lambda segment: _scan_watchlist_segment(client, segment, total_segments, index_name), range(total_segments)))
+
     try:
-        dynamodb = boto3.resource('dynamodb', region_name='ap-northeast-2')
-        table = dynamodb.Table('fiflow-users')
-        response = table.scan(
-            FilterExpression='SK BEGINS_WITH :sk',
-            ExpressionAttributeValues={':sk': 'STOCK#'}
-        )
-        stocks = [(item['symbol'], item['stockName']) for item in response.get('Items', [])]
-        if not stocks:
-            logger.info("데이터가 존재하지 않습니다.")
-            return []
-        logger.info(f"조회된 주식 목록: {len(stocks)}개")
-        return stocks
+        try:
+            segments = scan(WATCHLIST_INDEX)
+        except ClientError as e:
+            if not WATCHLIST_INDEX or e.response['Error']['Code'] != 'ValidationException':
+                raise
+            # GSI가 아직 없으면(생성 전) 기본 테이블 스캔
+            logger.warning(f"관심 종목 GSI({WATCHLIST_INDEX}) 조회 불가, 기본 테이블 스캔: {e}")
+            segments = scan(None)
     except ClientError as e:
         logger.error(f"주식 목록 조회 오류: {e}")
+        return {}
+    watchlists = {}
+    for items in segments:
+        for item in items:
+            symbol = _string_attr(item, 'symbol')
+            if symbol:
+                watchlists.setdefault(_string_attr(item, 'PK'), []).append(
+                    (symbol, _string_attr(item, 'stockName') or _string_attr(item, 'name')))
+    for holdings in watchlists.values():
+        holdings.sort()
+    return watchlists
+
+def _stocks_from_watchlists(watchlists):
+    """사용자별 관심 종목 → 중복 제거한 [(symbol, 종목명)]"""
+    names = {}
+    for holdings in watchlists.values():
+        for symbol, name in holdings:
+            if not names.get(symbol):
+                names[symbol] = name
+    stocks = list(names.items())
+    if not stocks:
+        logger.info("데이터가 존재하지 않습니다.")
         return []
+    logger.info(f"조회된 주식 목록: {len(stocks)}개 (사용자 {len(watchlists)}명, 보유 {sum(len(h) for h in watchlists.values())}건)")
+    return stocks
+
+def get_stocks_from_db(total_segments=None):
+    """DynamoDB에서 주식 목록 조회 (페이지네이션, 심볼 중복 제거)"""
+    return _stocks_from_watchlists(get_watchlists_from_db(total_segments))
 
 def get_market_data(symbol):
-    """네이버 금융에서 주가, 등락 정보 크롤링, 데이터 타입 처리"""
+    """네이버 금융에서 주가, 등락 정보 및 종목명 크롤링, 데이터 타입 처리 (sise 페이지 1회 요청)"""
     url = f"https://finance.naver.com/item/sise.naver?code={symbol}"
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124'}
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        price = int(soup.select_one("#_nowVal").text.replace(",", ""))
-        change_text = soup.select_one("#_diff").text.strip().replace(",", "")
-        change_rate_text = soup.select_one("#_rate").text.strip().replace("%", "")
-        change = 0
-        if '상승' in soup.select_one("p.no_exday").text:
-            change = int(re.search(r'\d+', change_text).group())
-        elif '하락' in soup.select_one("p.no_exday").text:
-            change = -int(re.search(r'\d+', change_text).group())
-        change_rate = float(change_rate_text)
-        logger.info(f"[{symbol}] 주가 데이터 크롤링 성공: price={price}, change={change}, changeRate={change_rate}")
-        return {
-            "price": price,
-            "change": change,
-            "changeRate": change_rate
-        }
+        market_data = extractors.parse_market_page(response.text)
+        logger.info(f"[{symbol}] 주가 데이터 크롤링 성공: price={market_data['price']}, change={market_data['change']}, changeRate={market_data['changeRate']}, stockName={market_data['stockName']}")
+        return market_data
     except Exception as e:
         print(f"[{symbol}] 크롤링 오류: {e}")
         return None
 
+# 폴링 API 등락 구분(rf): 1 상한, 2 상승, 3 보합, 4 하한, 5 하락
+RISE_FALL_SIGNS = {'1': 1, '2': 1, '3': 0, '4': -1, '5': -1}
+
+def _polling_market_data(item):
+    """폴링 API 종목 데이터 → get_market_data와 같은 형태 (부호는 등락 구분으로 맞춤)"""
+    sign = RISE_FALL_SIGNS.get(str(item.get('rf')))
+    change = int(item['cv'])
+    change_rate = float(item['cr'])
+    if sign is not None:
+        change, change_rate = sign * abs(change), sign * abs(change_rate)
+    return {
+        "price": int(item['nv']),
+        "change": change,
+        "changeRate": change_rate,
+        "stockName": item.get('nm') or None
+    }
+
+def get_polling_market_data(symbols):
+    """폴링 API 묶음 요청(SERVICE_ITEM:a,b,c)으로 여러 종목 시세를 HTML 파싱 없이 수집 → {종목코드: 시세}"""
+    datas, errors = polling_api.fetch_chunked('SERVICE_ITEM', symbols)
+    quotes = {}
+    for symbol, item in datas.items():
+        try:
+            quotes[symbol] = _polling_market_data(item)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"[{symbol}] 폴링 시세 변환 오류: {e}")
+    missing = len(set(symbols) - set(quotes))
+    logger.info(f"폴링 API 시세 수집: {len(quotes)}종목 (HTML 대체 필요 {missing}종목, 오류 {len(errors)}종목)")
+    return quotes
+
 def get_stock_name_from_symbol(symbol):
     """종목명 크롤링"""
     url = f"https://finance.naver.com/item/main.naver?code={symbol}"
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124'}
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        stock_name = soup.select_one("#middle > div.h_company > div.wrap_company > h2 > a").text.strip()
+        stock_name = extractors.parse_stock_name(response.text)
         logger.info(f"[{symbol}] 종목명: {stock_name}")
-        return stock_name or None
+        return stock_name
     except Exception as e:
         logger.error(f"[{symbol}] 종목명 오류: {e}")
         return None
@@ -81,17 +185,10 @@ def get_stock_name_from_symbol(symbol):
 def get_foreigner_net_buy(symbol):
     """외국인 순매매량 및 날짜 크롤링 (초기 버전)"""
     url = f"https://finance.naver.com/item/frgn.naver?code={symbol}"
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124'}
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        rows = soup.select("div.inner_sub table.type2 tr[onmouseover]")[:8]
-        foreigner_data = []
-        for row in rows:
-            date = row.select('td')[0].text.strip()
-            net_buy = int(row.select('td')[6].text.strip().replace(",", "") or 0)
-            foreigner_data.append({'date': date, 'net_buy': net_buy})
+        foreigner_data = extractors.parse_foreigner_rows(response.text, limit=8)
         while len(foreigner_data) < 8:
             foreigner_data.append({'date': '', 'net_buy': 0})
         logger.info(f"[{symbol}] 외국인 순매매량 데이터: {len(foreigner_data)}일치")
@@ -100,37 +197,113 @@ def get_foreigner_net_buy(symbol):
         logger.error(f"[{symbol}] 외국인 데이터 오류: {e}")
         return [{'date': '', 'net_buy': 0} for _ in range(8)]
 
+def _foreign_flow_lists(foreigner_data):
+    """[{'date', 'net_buy'}] → (순매매 배열, YYYY-MM-DD 날짜 배열)"""
+    return (
+        [data_item['net_buy'] for data_item in foreigner_data],
+        [data_item['date'].replace('.', '-') if data_item['date'] else '' for data_item in foreigner_data],
+    )
+
+def crawl_symbol(engine, symbol, name, writer=None, quotes=None, states=None, latest=None):
+    """심볼 하나의 주가/종목명/외국인 데이터를 병렬로 수집해 저장
+
+    writer가 있으면 일괄 저장 단계로 전달하고, quotes(일괄 수집한 시세)에 있는 종목은
+    종목 페이지 대신 그 값을 사용한다. states(크롤링 상태)가 있으면 외국인 매매 데이터는
+    공시 이후 하루 한 번만 새로 받고, 그 외에는 저장된 배열을 재사용한다.
+    latest(dict)가 있으면 만든 LATEST 항목을 종목별로 모은다 (관심 종목 스냅샷용).
+    """
+    logger.info(f"[{name}({symbol})] 크롤링 시작...")
+    quote = (quotes or {}).get(symbol)
+    foreign_due = states is None or states.foreign_flow_due(symbol)
+    fetch_market = (lambda: dict(quote)) if quote else (lambda: get_market_data(symbol))
+    if foreign_due and not quote:
+        market_data, foreigner_data = engine.fan_out(fetch_market, lambda: get_foreigner_net_buy(symbol))
+    else:
+        market_data = fetch_market()
+        foreigner_data = get_foreigner_net_buy(symbol) if foreign_due else None
+    if not market_data:
+        logger.error(f"[{name}({symbol})] 크롤링 실패")
+        return {"symbol": symbol, "status": "failed"}
+    foreign_flow = _foreign_flow_lists(foreigner_data) if foreigner_data is not None else None
+    history_through = None
+    if foreigner_data is not None and writer is not None and FOREIGN_HISTORY_ENABLED:
+        # 이력에는 마지막 저장 거래일 이후의 새 행만 추가
+        history_through = append_new_rows(symbol, foreigner_data, writer, states.history_through(symbol) if states else None)
+    if states is not None:
+        foreign_flow = states.resolve_foreign_flow(symbol, foreign_flow, writer, history_through=history_through)
+    if foreign_flow is None:
+        foreign_flow = _foreign_flow_lists(get_foreigner_net_buy(symbol))
+    # sise 페이지에서 종목명을 얻지 못한 경우에만 캐시 → main 페이지 순으로 조회
+    page_name = market_data.pop('stockName', None)
+    if page_name:
+        name_cache.remember(symbol, page_name)
+    actual_stock_name = page_name or name_cache.resolve_name(symbol, get_stock_name_from_symbol) or name
+    if not actual_stock_name:
+        logger.warning(f"[{name}({symbol})] 종목명 크롤링 실패. 데이터 저장 건너뜝.")
+        return {"symbol": symbol, "status": "failed"}
+    market_data['symbol'] = symbol
+    market_data['date'] = datetime.date.today().isoformat()
+    market_data['stockName'] = actual_stock_name
+    market_data['foreignerNetBuy'], market_data['foreignerNetBuyDate'] = foreign_flow
+    logger.info(f"크롤링 데이터: {market_data}")
+    if writer is not None:
+        # 날짜별 항목과 LATEST 읽기 모델을 같은 배치 흐름으로 저장 (값이 같으면 쓰기 생략)
+        latest_item = build_latest_market_data_item(market_data)
+        writer.put(MarketDataRecord.from_dict(market_data), tag=symbol)
+        writer.put(latest_item, tag=symbol)
+        if latest is not None:
+            latest[symbol] = latest_item
+        return {"symbol": symbol, "status": "success"}
+    try:
+        create_market_data(market_data)
+        create_latest_market_data(market_data)
+    except ClientError as e:
+        logger.error(f"[{name}({symbol})] 저장 실패: {e}")
+        return {"symbol": symbol, "status": "failed"}
+    return {"symbol": symbol, "status": "success"}
+
 def main(event=None, context=None):
     """메인 실행 함수: Lambda 이벤트로 심볼 목록 처리"""
     try:
         symbols = event.get('symbols', None) if event else None
-        stocks = [(s, get_stock_name_from_symbol(s)) for s in symbols] if symbols else get_stocks_from_db()
+        max_in_flight = event.get('maxInFlight') if event else None
+        for symbol in (event.get('invalidateNames') or []) if event else []:
+            name_cache.invalidate(symbol)
+        mode = (event.get('mode') if event else None) or CRAWL_MODE
+        quotes = None
+        if mode == 'market':
+            # 시장 전체 모드: 시가총액 목록 페이지로 전 종목 시세를 먼저 일괄 수집
+            quotes = get_market_listings()
+        watchlists = None
+        if mode == 'market' and event and event.get('allSymbols'):
+            stocks = [(s, quote['stockName']) for s, quote in quotes.items()]
+        elif symbols:
+            stocks = [(s, None) for s in symbols]
+        else:
+            watchlists = get_watchlists_from_db()
+            stocks = _stocks_from_watchlists(watchlists)
         if not stocks:
             logger.info("크롤링할 주식 목록이 없습니다.")
             return {"statusCode": 200, "body": json.dumps([])}
-        logger.info(f"{len(stocks)}개의 주식 정보를 크롤링합니다.")
-        results = []
-        for symbol, name in stocks:
-            logger.info(f"[{name}({symbol})] 크롤링 시작...")
-            market_data = get_market_data(symbol)
-            if market_data:
-                actual_stock_name = get_stock_name_from_symbol(symbol) or name
-                if not actual_stock_name:
-                    logger.warning(f"[{name}({symbol})] 종목명 크롤링 실패. 데이터 저장 건너뜝.")
-                    results.append({"symbol": symbol, "status": "failed"})
-                    continue
-                foreigner_data = get_foreigner_net_buy(symbol)
-                market_data['symbol'] = symbol
-                market_data['date'] = datetime.date.today().isoformat()
-                market_data['stockName'] = actual_stock_name
-                market_data['foreignerNetBuy'] = [data_item['net_buy'] for data_item in foreigner_data]
-                market_data['foreignerNetBuyDate'] = [data_item['date'].replace('.', '-') if data_item['date'] else '' for data_item in foreigner_data]
-                logger.info(f"크롤링 데이터: {market_data}")
-                create_market_data(market_data)
-                results.append({"symbol": symbol, "status": "success"})
-            else:
-                logger.error(f"[{name}({symbol})] 크롤링 실패")
-                results.append({"symbol": symbol, "status": "failed"})
+        if mode == 'polling':
+            quotes = get_polling_market_data([symbol for symbol, _ in stocks])
+        states = None
+        if FRESHNESS_ENABLED:
+            states = _crawl_states
+            states.load([symbol for symbol, _ in stocks])
+        logger.info(f"{len(stocks)}개의 주식 정보를 크롤링합니다. (모드: {mode})")
+        latest = {}
+        with BatchWriter(elide=True) as writer:
+            results = crawl(partial(crawl_symbol, writer=writer, quotes=quotes, states=states, latest=latest), stocks, max_in_flight)
+        logger.info(f"변경 없는 항목 쓰기 생략: {writer.elided}건")
+        if watchlists and SNAPSHOT_ENABLED:
+            # 스냅샷에 담긴 시세가 이번 LATEST와 다른 사용자만 관심 종목 스냅샷 재생성
+            snapshot_writer = BatchWriter(elide=True)
+            rebuilt = _snapshots.rebuild(watchlists, latest, snapshot_writer)
+            logger.info(f"관심 종목 스냅샷: {rebuilt}/{len(watchlists)}명 재생성 (쓰기 생략 {snapshot_writer.elided}건)")
+        for result in results:
+            if result['status'] == 'success':
+                result['status'] = writer.results.get(result['symbol'], 'failed')
         return {"statusCode": 200, "body": json.dumps(results)}
     except Exception as e:
         logger.error(f"오류 발생: {e}")
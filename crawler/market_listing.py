@@ -0,0 +1,48 @@
+# crawler/market_listing.py
+import logging
+import http_client
+import extractors
+from crawl_engine import CrawlEngine
+
+logger = logging.getLogger(__name__)
+
+# 네이버 금융 시가총액 목록 (페이지당 50종목)
+LISTING_URL = "https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}"
+MARKETS = {'KOSPI': 0, 'KOSDAQ': 1}
+
+def fetch_listing_page(market, page):
+    """시가총액 목록 한 페이지 → (행 목록, 마지막 페이지 번호), 실패 시 ([], 0)"""
+    url = LISTING_URL.format(sosok=MARKETS[market], page=page)
+    try:
+        response = http_client.get(url)
+        response.raise_for_status()
+        return extractors.parse_market_sum_page(response.text)
+    except Exception as e:
+        logger.error(f"[{market} {page}p] 시가총액 목록 크롤링 오류: {e}")
+        return [], 0
+
+def get_market_listings(markets=tuple(MARKETS), engine=None):
+    """전 종목 현재가/전일비/등락률/종목명 수집 → {종목코드: 시세}
+
+    각 시장의 1페이지로 마지막 페이지 번호를 확인한 뒤 나머지 페이지를 병렬로 받아 파싱한다.
+    """
+    if engine is None:
+        with CrawlEngine() as owned_engine:
+            return get_market_listings(markets, owned_engine)
+
+    first_pages = engine.fan_out(*[lambda market=market: fetch_listing_page(market, 1) for market in markets])
+    pages = [rows for rows, _ in first_pages]
+    rest = [
+        lambda market=market, page=page: fetch_listing_page(market, page)[0]
+        for market, (_, last_page) in zip(markets, first_pages)
+        for page in range(2, last_page + 1)
+    ]
+    pages.extend(engine.fan_out(*rest))
+
+    listings = {}
+    for rows in pages:
+        for row in rows:
+            symbol = row.pop('symbol')
+            listings.setdefault(symbol, row)
+    logger.info(f"시가총액 목록 수집 완료: {len(listings)}종목 ({len(first_pages) + len(rest)}페이지)")
+    return listings
@@ -0,0 +1,163 @@
+# crawler/model_cache.py
+"""botocore 서비스 모델 사전 직렬화 캐시
+
+콜드 스타트에서 DynamoDB 리소스/클라이언트를 만들 때 botocore 로더는 서비스 목록 디렉터리를 여러 번 훑고
+endpoints.json, dynamodb service-2.json.gz, endpoint-rule-set-1.json.gz 등을 열어 JSON으로 파싱한다.
+빌드 시점에 크롤러가 실제로 만드는 리소스를 한 번 생성하면서 로더가 읽은 결과(Loader 인스턴스 캐시)를
+그대로 pickle로 저장해 두고, 실행 시에는 그 캐시를 미리 채운 로더를 세션에 등록해 파일 탐색/파싱을 건너뛴다.
+캐시에 없는 항목(다른 서비스 등)은 원래대로 디스크에서 읽는다.
+
+캐시는 python_libs에 포함된 boto3/botocore로만 만든다. Lambda에서는 핸들러가 먼저 import하는 vendor_path.py가 python_libs를 sys.path 맨 앞에 두어
+런타임 내장 boto3 대신 이 버전을 import하고, 로컬 venv는 requirements.txt에서 같은 버전을 고정한다.
+실행 시 import된 boto3/botocore 버전이 캐시와 다르면 캐시를 쓰지 않는다.
+
+사용법: python model_cache.py [출력 파일]      (setup.sh에서 실행, python_libs 갱신 시 다시 생성)
+        python model_cache.py --check [파일]   (배포 전 확인: 캐시가 없거나 python_libs와 버전이 다르면 종료 코드 1)
+"""
+import os
+import sys
+import pickle
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODEL_CACHE_ENABLED = os.environ.get('BOTOCORE_MODEL_CACHE', '1') == '1'
+MODEL_CACHE_FILE = os.environ.get('BOTOCORE_MODEL_CACHE_FILE',
+                                  os.path.join(os.path.dirname(os.path.abspath(__file__)), 'botocore_models.pickle'))
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python_libs')
+CACHE_FORMAT = 1
+# 크롤러가 사용하는 서비스 (aws_clients.get_resource / get_client 대상)
+CACHED_SERVICES = ('dynamodb',)
+
+def _versions():
+    import boto3
+    import botocore
+    return {'format': CACHE_FORMAT, 'botocore': botocore.__version__, 'boto3': boto3.__version__}
+
+def _package_root():
+    # botocore/boto3 패키지가 함께 있는 디렉터리 (python_libs), 데이터 파일 경로를 여기 기준 상대 경로로 저장
+    from botocore import BOTOCORE_ROOT
+    return os.path.dirname(BOTOCORE_ROOT)
+
+def _vendored():
+    # import된 botocore가 python_libs에 포함된 패키지인지 여부
+    return os.path.realpath(_package_root()) == os.path.realpath(VENDOR_DIR)
+
+def _recording_loader():
+    from botocore.loaders import Loader
+    # ~/.aws/models, AWS_DATA_PATH는 제외하고 패키지에 포함된 모델만 캐시
+    return Loader(extra_search_paths=[Loader.BUILTIN_DATA_PATH], include_default_search_paths=False)
+
+def _relative_entries(cache):
+    """로더 인스턴스 캐시에서 패키지 안의 파일로 찾은 항목만 남기고 경로를 상대 경로로 바꿈"""
+    root = _package_root()
+    entries = {}
+    for key, value in cache.items():
+        if key[0] == 'load_data_with_path':
+            data, path = value
+            relative = os.path.relpath(path, root)
+            if relative.startswith(os.pardir):
+                continue
+            value = (data, relative)
+        entries[key] = value
+    return entries
+
+def build(path=MODEL_CACHE_FILE):
+    """크롤러와 같은 설정으로 리소스를 만들며 로더가 읽은 모델을 pickle로 저장, 저장한 항목 수 반환"""
+    import botocore.session
+    import boto3
+    import aws_clients
+
+    if not _vendored():
+        raise RuntimeError(f"python_libs가 아닌 botocore로는 캐시를 만들지 않습니다: {_package_root()}")
+    loader = _recording_loader()
+    core = botocore.session.get_session()
+    core.register_component('data_loader', loader)
+    session = boto3.session.Session(botocore_session=core, region_name=aws_clients.AWS_REGION)
+    for service in CACHED_SERVICES:
+        # 리소스 생성 시 resources-1 → service-2 → endpoint-rule-set-1, endpoints/partitions 등을 읽음
+        session.resource(service, config=aws_clients.get_config())
+
+    entries = _relative_entries(loader._cache)
+    payload = dict(_versions(), entries=entries)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return len(entries)
+
+def _mismatch(payload, require_vendored=False):
+    """캐시를 현재 import된 boto3/botocore에 쓸 수 없는 이유, 쓸 수 있으면 None"""
+    if require_vendored and not _vendored():
+        return f"python_libs가 아닌 botocore가 로드됨 ({_package_root()})"
+    cached = {k: payload.get(k) for k in ('format', 'botocore', 'boto3')}
+    if cached != _versions():
+        return f"버전 불일치 (캐시 {cached}, 현재 {_versions()}), python model_cache.py로 다시 생성"
+    return None
+
+def _load_entries(path):
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        logger.debug(f"botocore 모델 캐시 없음: {path}")
+        return None
+    except Exception as e:
+        logger.warning(f"botocore 모델 캐시 로드 실패, 기본 로더 사용: {e}")
+        return None
+    problem = _mismatch(payload)
+    if problem:
+        logger.error(f"botocore 모델 캐시 사용 안 함: {problem}")
+        return None
+    root = _package_root()
+    entries = payload['entries']
+    for key, value in entries.items():
+        if key[0] == 'load_data_with_path':
+            data, relative = value
+            entries[key] = (data, os.path.join(root, relative))
+    return entries
+
+def create_loader(data_path=None, path=None):
+    """캐시를 미리 채운 botocore Loader, 캐시를 쓸 수 없으면 None (세션 기본 로더 사용)
+
+    data_path(AWS_DATA_PATH)가 지정되면 사용자 모델이 우선이므로 캐시를 쓰지 않는다.
+    """
+    if not MODEL_CACHE_ENABLED or data_path:
+        return None
+    entries = _load_entries(path or MODEL_CACHE_FILE)
+    if entries is None:
+        return None
+    from botocore.loaders import Loader
+    loader = Loader()
+    # instance_cache가 조회하는 캐시를 채워 두면 load_service_model 등은 디스크를 보기 전에 여기서 반환됨
+    loader._cache.update(entries)
+    return loader
+
+def check(path=MODEL_CACHE_FILE):
+    """배포 전 확인: 캐시를 python_libs의 boto3/botocore에 쓸 수 없는 이유, 쓸 수 있으면 None"""
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return f"캐시 파일 없음: {path} (python model_cache.py로 생성)"
+    except Exception as e:
+        return f"캐시 파일을 읽을 수 없음: {e}"
+    return _mismatch(payload, require_vendored=True)
+
+def main(argv):
+    logging.basicConfig(level=logging.INFO)
+    if argv and argv[0] == '--check':
+        path = argv[1] if len(argv) > 1 else MODEL_CACHE_FILE
+        problem = check(path)
+        if problem:
+            sys.exit(f"botocore 모델 캐시 확인 실패: {problem}")
+        print(f"botocore 모델 캐시 확인: {path} (botocore {_versions()['botocore']}, boto3 {_versions()['boto3']})")
+        return
+    path = argv[0] if argv else MODEL_CACHE_FILE
+    count = build(path)
+    print(f"botocore 모델 캐시 생성: {path} ({count}개 항목, {os.path.getsize(path) / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    # Lambda 핸들러와 같은 순서로 python_libs의 boto3/botocore를 우선 import
+    sys.path.insert(0, VENDOR_DIR)
+    main(sys.argv[1:])
@@ -0,0 +1,165 @@
+# crawler/name_cache.py
+import os
+import json
+import time
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from botocore.exceptions import BotoCoreError, ClientError
+
+logger = logging.getLogger(__name__)
+
+# 종목명 캐시 설정 (환경 변수로 조정 가능)
+NAME_CACHE_SIZE = int(os.environ.get('NAME_CACHE_SIZE', '4096'))
+NAME_CACHE_TTL = int(os.environ.get('NAME_CACHE_TTL', str(30 * 24 * 3600)))
+# dynamodb | file | none (Lambda에서는 DynamoDB, 로컬 CLI에서는 파일이 기본값)
+NAME_CACHE_BACKEND = os.environ.get('NAME_CACHE_BACKEND', 'dynamodb' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'file')
+NAME_CACHE_FILE = os.environ.get('NAME_CACHE_FILE', os.path.join(tempfile.gettempdir(), 'fiflow_stock_names.json'))
+NAME_SK = 'STOCKNAME'
+
+class _LRUCache:
+    """만료 시각을 가진 스레드 안전 LRU (워밍된 Lambda 인스턴스에서 유지)"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+class DynamoNameStore:
+    """PK=STOCK#<symbol>, SK=STOCKNAME 항목에 종목명 저장 (expiresAt은 DynamoDB TTL 속성으로 사용 가능)"""
+
+    def get(self, symbol):
+        from db import get_table
+        item = get_table().get_item(Key={'PK': f'STOCK#{symbol}', 'SK': NAME_SK}).get('Item')
+        if not item:
+            return None
+        return item.get('stockName'), int(item.get('expiresAt', 0))
+
+    def put(self, symbol, name, expires_at):
+        from db import get_table
+        get_table().put_item(Item={
+            'PK': f'STOCK#{symbol}',
+            'SK': NAME_SK,
+            'symbol': symbol,
+            'stockName': name,
+            'expiresAt': int(expires_at),
+        })
+
+    def delete(self, symbol):
+        from db import get_table
+        get_table().delete_item(Key={'PK': f'STOCK#{symbol}', 'SK': NAME_SK})
+
+class FileNameStore:
+    """로컬 JSON 파일에 종목명 저장 (CLI/로컬 실행용)"""
+
+    def __init__(self, path=NAME_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, symbol):
+        with self._lock:
+            entry = self._load().get(symbol)
+        return (entry['stockName'], int(entry['expiresAt'])) if entry else None
+
+    def put(self, symbol, name, expires_at):
+        with self._lock:
+            data = self._load()
+            data[symbol] = {'stockName': name, 'expiresAt': int(expires_at)}
+            self._save(data)
+
+    def delete(self, symbol):
+        with self._lock:
+            data = self._load()
+            if data.pop(symbol, None) is not None:
+                self._save(data)
+
+_memory = _LRUCache(NAME_CACHE_SIZE)
+_store = {'dynamodb': DynamoNameStore, 'file': FileNameStore}.get(NAME_CACHE_BACKEND, lambda: None)()
+
+def get_name(symbol):
+    """메모리 LRU → 영구 저장소 순으로 종목명 조회 (없거나 만료되면 None)"""
+    name = _memory.get(symbol)
+    if name or _store is None:
+        return name
+    try:
+        entry = _store.get(symbol)
+    except (BotoCoreError, ClientError, OSError) as e:
+        logger.warning(f"[{symbol}] 종목명 캐시 조회 오류: {e}")
+        return None
+    if not entry or not entry[0] or entry[1] <= time.time():
+        return None
+    _memory.put(symbol, entry[0], entry[1])
+    return entry[0]
+
+def remember(symbol, name):
+    """이미 얻은 종목명을 메모리 LRU에만 반영 (영구 저장소 쓰기 없음)"""
+    if name:
+        _memory.put(symbol, name, time.time() + NAME_CACHE_TTL)
+
+def put_name(symbol, name):
+    """종목명을 메모리 LRU와 영구 저장소에 모두 기록"""
+    expires_at = time.time() + NAME_CACHE_TTL
+    _memory.put(symbol, name, expires_at)
+    if _store is None:
+        return
+    try:
+        _store.put(symbol, name, expires_at)
+    except (BotoCoreError, ClientError, OSError) as e:
+        logger.warning(f"[{symbol}] 종목명 캐시 저장 오류: {e}")
+
+def invalidate(symbol):
+    """종목명 캐시 명시적 무효화 (메모리 + 영구 저장소)"""
+    _memory.pop(symbol)
+    if _store is None:
+        return
+    try:
+        _store.delete(symbol)
+    except (BotoCoreError, ClientError, OSError) as e:
+        logger.warning(f"[{symbol}] 종목명 캐시 삭제 오류: {e}")
+
+def resolve_name(symbol, fetch):
+    """캐시에 없을 때만 fetch(symbol)로 네트워크 조회 후 캐시에 저장"""
+    name = get_name(symbol)
+    if name:
+        return name
+    name = fetch(symbol)
+    if name:
+        put_name(symbol, name)
+    return name
@@ -0,0 +1,53 @@
+# crawler/polling_api.py
+import os
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import http_client
+
+logger = logging.getLogger(__name__)
+
+POLLING_URL = "https://polling.finance.naver.com/api/realtime"
+# 한 번의 폴링 요청에 묶을 코드 수
+POLLING_CHUNK_SIZE = int(os.environ.get('POLLING_CHUNK_SIZE', '20'))
+POLLING_ERRORS = (requests.exceptions.RequestException, json.JSONDecodeError, KeyError, IndexError, TypeError)
+
+def fetch_area(service, codes):
+    """SERVICE_ITEM:a,b,c / SERVICE_INDEX:... 묶음 요청 1회 → {코드: 원본 데이터} (오류는 그대로 발생)"""
+    url = f"{POLLING_URL}?query={service}:{','.join(codes)}"
+    headers = {'Referer': f'https://finance.naver.com/item/sise.naver?code={codes[0]}'} if service == 'SERVICE_ITEM' else None
+    response = http_client.get(url, headers=headers)
+    response.raise_for_status()
+
+    # API 응답이 순수 JSON이므로, 바로 파싱합니다.
+    data = response.json()
+    datas = {}
+    for area in data['result']['areas']:
+        if area.get('name', service) == service:
+            for item in area['datas']:
+                datas[item['cd']] = item
+    return datas
+
+def _fetch_chunk(service, chunk):
+    try:
+        return fetch_area(service, chunk), {}
+    except POLLING_ERRORS as e:
+        logger.error(f"[{service}:{','.join(chunk)}] 폴링 API 오류: {e}")
+        return {}, {code: str(e) for code in chunk}
+
+def fetch_chunked(service, codes, chunk_size=None):
+    """코드 목록을 chunk_size 단위 묶음 요청으로 나눠 병렬 조회 → ({코드: 원본 데이터}, {코드: 오류 메시지})"""
+    codes = list(dict.fromkeys(codes))
+    chunk_size = chunk_size or POLLING_CHUNK_SIZE
+    chunks = [codes[i:i + chunk_size] for i in range(0, len(codes), chunk_size)]
+    if len(chunks) <= 1:
+        chunk_results = [_fetch_chunk(service, chunk) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            chunk_results = list(executor.map(lambda chunk: _fetch_chunk(service, chunk), chunks))
+    datas, errors = {}, {}
+    for chunk_datas, chunk_errors in chunk_results:
+        datas.update(chunk_datas)
+        errors.update(chunk_errors)
+    return datas, errors
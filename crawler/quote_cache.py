@@ -0,0 +1,102 @@
+# crawler/quote_cache.py
+import os
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 실시간 시세 캐시 설정 (초 단위 TTL, 0이면 캐시 없이 요청 병합만 수행)
+QUOTE_CACHE_TTL = float(os.environ.get('QUOTE_CACHE_TTL', '1.0'))
+QUOTE_CACHE_MAX_ENTRIES = int(os.environ.get('QUOTE_CACHE_MAX_ENTRIES', '2048'))
+
+class _Flight:
+    """진행 중인 업스트림 요청 1건 (같은 종목의 동시 미스가 결과를 공유)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+        self._event.set()
+
+    def wait(self):
+        self._event.wait()
+        return self.value
+
+class QuoteCache:
+    """워밍된 Lambda 인스턴스 범위의 짧은 TTL 시세 캐시 + single-flight 요청 병합"""
+
+    def __init__(self, ttl=QUOTE_CACHE_TTL, max_entries=QUOTE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, symbols, fetch_many):
+        """캐시 적중 종목은 바로 반환하고, 미스 종목만 fetch_many(list) -> {종목: 시세}로 한 번에 조회
+
+        반환값: (종목별 시세 dict, 이번 호출의 hits/misses/coalesced 통계)
+        """
+        stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+        quotes = {}
+        owned = []
+        waiting = {}
+        now = time.monotonic()
+        with self._lock:
+            for symbol in symbols:
+                entry = self._entries.get(symbol)
+                if entry and entry[1] > now:
+                    quotes[symbol] = entry[0]
+                    stats['hits'] += 1
+                elif symbol in self._inflight:
+                    waiting[symbol] = self._inflight[symbol]
+                    stats['coalesced'] += 1
+                else:
+                    self._inflight[symbol] = _Flight()
+                    owned.append(symbol)
+                    stats['misses'] += 1
+            self.hits += stats['hits']
+            self.misses += stats['misses']
+            self.coalesced += stats['coalesced']
+
+        if owned:
+            fetched = {}
+            try:
+                fetched = fetch_many(owned)
+            except Exception as e:
+                fetched = {symbol: {"error": str(e)} for symbol in owned}
+            finally:
+                self._complete(owned, fetched)
+            for symbol in owned:
+                quotes[symbol] = fetched.get(symbol) or {"error": "시세 데이터가 없습니다."}
+
+        for symbol, flight in waiting.items():
+            quotes[symbol] = flight.wait()
+        return quotes, stats
+
+    def _complete(self, owned, fetched):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            if len(self._entries) + len(owned) > self.max_entries:
+                self._evict()
+            for symbol in owned:
+                quote = fetched.get(symbol) or {"error": "시세 데이터가 없습니다."}
+                # 오류 응답은 캐시하지 않음
+                if self.ttl > 0 and 'error' not in quote:
+                    self._entries[symbol] = (quote, expires_at)
+                self._inflight.pop(symbol).set(quote)
+
+    def _evict(self):
+        now = time.monotonic()
+        self._entries = {symbol: entry for symbol, entry in self._entries.items() if entry[1] > now}
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+    def log_stats(self):
+        logger.info(f"시세 캐시 누적 통계: hits={self.hits}, misses={self.misses}, coalesced={self.coalesced}")
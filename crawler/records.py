@@ -0,0 +1,148 @@
+# crawler/records.py
+import datetime
+from decimal import Decimal
+import db
+from flow_codec import pack_foreign_flow
+
+# MarketData / IndexData 저장용 레코드 (__slots__)
+# DynamoDB 저수준 client의 AttributeValue 형식({'S': ...}, {'N': ...})으로 바로 직렬화해
+# 리소스 계층의 dict 생성 → Decimal 변환 → TypeSerializer 과정을 건너뛴다.
+# 업무 필드 지문은 build_*_item 결과와 같은 값이 나오도록 계산한다 (쓰기 생략 호환).
+
+def _number_text(value):
+    # Decimal(str(x))와 같은 숫자 문자열 (지수 표기만 Decimal로 풀어 씀)
+    text = str(value)
+    if 'e' in text or 'E' in text:
+        text = str(Decimal(text))
+    return text
+
+def _now():
+    return datetime.datetime.utcnow().isoformat() + 'Z'
+
+class MarketDataRecord:
+    """STOCK#<symbol> / MARKETDATA#<date> 항목"""
+
+    __slots__ = ('symbol', 'date', 'price', 'change', 'change_rate', 'stock_name',
+                 'net_buys', 'net_buy_dates', 'timestamp', '_fingerprint')
+
+    def __init__(self, symbol, date, price, change, change_rate, stock_name, net_buys=None, net_buy_dates=None, timestamp=None):
+        self.symbol = symbol
+        self.date = date
+        self.price = int(price)
+        self.change = int(change)
+        self.change_rate = _number_text(change_rate)
+        self.stock_name = stock_name
+        self.net_buys = [int(x) for x in net_buys] if net_buys is not None else [0] * 8
+        self.net_buy_dates = list(net_buy_dates) if net_buy_dates is not None else [''] * 8
+        self.timestamp = timestamp or _now()
+        self._fingerprint = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """build_market_data_item과 같은 입력(dict)으로 생성"""
+        return cls(data["symbol"], data["date"], data["price"], data["change"], data["changeRate"], data["stockName"],
+                   data.get("foreignerNetBuy"), data.get("foreignerNetBuyDate"))
+
+    @property
+    def key(self):
+        return f'STOCK#{self.symbol}', f'MARKETDATA#{self.date}'
+
+    def _business_fields(self):
+        pk, sk = self.key
+        fields = {'PK': pk, 'SK': sk, 'symbol': self.symbol, 'date': self.date, 'price': self.price,
+                  'change': self.change, 'changeRate': self.change_rate, 'stockName': self.stock_name}
+        if db.WRITE_GSI_KEYS:
+            fields['symbol_date'] = f'{self.symbol}_{self.date}'
+        if db.MARKETDATA_COMPACT:
+            fields[db.FLOW_ATTR] = pack_foreign_flow(self.net_buys, self.net_buy_dates)
+        else:
+            fields['foreignerNetBuy'] = self.net_buys
+            fields['foreignerNetBuyDate'] = self.net_buy_dates
+        return fields
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = db.fingerprint(self._business_fields())
+        return self._fingerprint
+
+    def to_wire(self):
+        """저수준 client용 AttributeValue 항목"""
+        pk, sk = self.key
+        item = {
+            'PK': {'S': pk},
+            'SK': {'S': sk},
+            'symbol': {'S': self.symbol},
+            'date': {'S': self.date},
+            'price': {'N': str(self.price)},
+            'change': {'N': str(self.change)},
+            'changeRate': {'N': self.change_rate},
+            'stockName': {'S': self.stock_name},
+            'createdAt': {'S': self.timestamp},
+            'updatedAt': {'S': self.timestamp},
+            db.FINGERPRINT_ATTR: {'S': self.fingerprint},
+        }
+        if db.WRITE_GSI_KEYS:
+            item['symbol_date'] = {'S': f'{self.symbol}_{self.date}'}
+        if db.MARKETDATA_COMPACT:
+            item[db.FLOW_ATTR] = {'B': pack_foreign_flow(self.net_buys, self.net_buy_dates)}
+        else:
+            item['foreignerNetBuy'] = {'L': [{'N': str(x)} for x in self.net_buys]}
+            item['foreignerNetBuyDate'] = {'L': [{'S': x} for x in self.net_buy_dates]}
+        return item
+
+class IndexDataRecord:
+    """INDEX#<name> / DATA#<date> 항목"""
+
+    __slots__ = ('name', 'date', 'value', 'change', 'change_rate', 'timestamp', '_fingerprint')
+
+    def __init__(self, name, date, value, change, change_rate, timestamp=None):
+        self.name = name
+        self.date = date
+        self.value = _number_text(value)
+        self.change = _number_text(change)
+        self.change_rate = _number_text(change_rate)
+        self.timestamp = timestamp or _now()
+        self._fingerprint = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """build_index_data_item과 같은 입력(dict)으로 생성"""
+        return cls(data["name"], data["date"], data["value"], data["change"], data["changeRate"])
+
+    @property
+    def key(self):
+        return f'INDEX#{self.name}', f'DATA#{self.date}'
+
+    def _business_fields(self):
+        pk, sk = self.key
+        fields = {'PK': pk, 'SK': sk, 'name': self.name, 'value': self.value, 'change': self.change,
+                  'changeRate': self.change_rate, 'date': self.date}
+        if db.WRITE_GSI_KEYS:
+            fields['index_name_date'] = f'{self.name}_{self.date}'
+        return fields
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = db.fingerprint(self._business_fields())
+        return self._fingerprint
+
+    def to_wire(self):
+        """저수준 client용 AttributeValue 항목"""
+        pk, sk = self.key
+        item = {
+            'PK': {'S': pk},
+            'SK': {'S': sk},
+            'name': {'S': self.name},
+            'value': {'N': self.value},
+            'change': {'N': self.change},
+            'changeRate': {'N': self.change_rate},
+            'date': {'S': self.date},
+            'createdAt': {'S': self.timestamp},
+            'updatedAt': {'S': self.timestamp},
+            db.FINGERPRINT_ATTR: {'S': self.fingerprint},
+        }
+        if db.WRITE_GSI_KEYS:
+            item['index_name_date'] = {'S': f'{self.name}_{self.date}'}
+        return item
@@ -18,5 +18,12 @@ source venv/bin/activate
 echo "필요한 패키지들을 설치합니다..."
 pip install -r requirements.txt
 
+# DynamoDB botocore 모델 캐시 생성 (콜드 스타트 단축, python_libs 갱신 시 다시 실행)
+echo "botocore 모델 캐시를 생성합니다..."
+if ! python model_cache.py; then
+    echo "botocore 모델 캐시 생성에 실패했습니다. python_libs의 boto3/botocore를 확인하세요." >&2
+    exit 1
+fi
+
 echo "크롤러 설정이 완료되었습니다!"
 echo "가상환경을 활성화하려면: source venv/bin/activate" 
\ No newline at end of file
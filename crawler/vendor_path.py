@@ -0,0 +1,16 @@
+# crawler/vendor_path.py
+"""python_libs를 sys.path에 추가 (핸들러 모듈에서 다른 import보다 먼저 import)
+
+Lambda에서는 런타임 내장 boto3 대신 python_libs의 고정 버전을 쓰도록 맨 앞에 두고(botocore 모델 캐시 기준, model_cache.py),
+로컬에서는 venv 패키지가 우선하도록 맨 뒤에 둔다. 이미 있으면 다시 추가하지 않는다.
+"""
+import os
+import sys
+
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python_libs')
+
+if VENDOR_DIR not in sys.path:
+    if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        sys.path.insert(0, VENDOR_DIR)
+    else:
+        sys.path.append(VENDOR_DIR)
@@ -0,0 +1,103 @@
+# crawler/watchlist_snapshot.py
+import datetime
+import logging
+import threading
+from decimal import Decimal
+from botocore.exceptions import ClientError
+from db import batch_get_latest_market_data, fingerprint
+
+logger = logging.getLogger(__name__)
+
+# 사용자별 관심 종목 스냅샷 (PK=USER#<id>, SK=WATCHLIST_SNAPSHOT)
+# /stocks/marketdata 응답 배열을 그대로 holdings에 담아, 관심 종목 화면을 GetItem/Query 1회로 처리
+SNAPSHOT_SK = 'WATCHLIST_SNAPSHOT'
+
+def _market_view(latest):
+    # LATEST 항목 → /stocks/marketdata의 marketData 형태
+    if not latest:
+        return None
+    return {
+        'price': latest['price'],
+        'change': latest['change'],
+        'changeRate': latest['changeRate'],
+        'date': latest['date'],
+        'foreignerNetBuy': latest['foreignerNetBuy'],
+    }
+
+def _plain(value):
+    # 숫자는 문자열로 통일 (이번 실행에서 만든 int와 DynamoDB에서 읽은 Decimal의 지문이 같도록)
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, (int, Decimal)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+def market_view_signature(latest):
+    """스냅샷에 담기는 종목 시세(marketData)의 지문, LATEST가 없으면 None"""
+    view = _market_view(latest)
+    return fingerprint({'marketData': _plain(view)}) if view else None
+
+def build_snapshot_item(user_pk, holdings, latest):
+    """사용자 관심 종목 [(symbol, name)]과 종목별 LATEST 항목으로 스냅샷 항목 생성"""
+    user_id = user_pk[len('USER#'):]
+    return {
+        'PK': user_pk,
+        'SK': SNAPSHOT_SK,
+        'symbols': [symbol for symbol, _ in holdings],
+        'holdings': [
+            {'symbol': symbol, 'name': name, 'userId': user_id, 'marketData': _market_view(latest.get(symbol))}
+            for symbol, name in holdings
+        ],
+        'updatedAt': datetime.datetime.utcnow().isoformat() + 'Z'
+    }
+
+class SnapshotBuilder:
+    """스냅샷에 담긴 종목 시세가 현재 LATEST와 다른 사용자(또는 관심 종목 구성이 바뀐 사용자)만 스냅샷을 다시 만듦
+
+    사용자별로 마지막으로 쓴 스냅샷의 관심 종목 구성과 종목별 시세 지문을 워밍된 인스턴스에서 유지하고,
+    이번 실행의 쓰기 여부가 아니라 그 지문과 이번 실행의 LATEST를 비교한다. 그래서 symbols 실행이나
+    시장 전체 모드가 LATEST만 갱신하고 스냅샷을 건너뛰었어도 다음 관심 종목 실행에서 다시 만들어진다.
+    콜드 스타트에서는 모든 사용자를 대상으로 하되 내용이 같은 스냅샷은 쓰기 생략으로 걸러진다.
+    """
+
+    def __init__(self):
+        self._embedded = {}
+        self._lock = threading.Lock()
+
+    def affected_users(self, watchlists, latest):
+        """스냅샷을 다시 만들 사용자 목록 (latest: 이번 실행에서 만든 종목별 LATEST 항목)"""
+        signatures = {symbol: market_view_signature(item) for symbol, item in latest.items()}
+        users = []
+        with self._lock:
+            for user_pk, holdings in watchlists.items():
+                embedded = self._embedded.get(user_pk)
+                if (embedded is None or embedded[0] != tuple(holdings)
+                        or any(symbol in signatures and embedded[1].get(symbol) != signatures[symbol] for symbol, _ in holdings)):
+                    users.append(user_pk)
+        return users
+
+    def rebuild(self, watchlists, latest, writer):
+        """스냅샷 재생성 → 대상 사용자 수 (이번 실행에서 만든 LATEST가 없는 종목은 일괄 조회)"""
+        users = self.affected_users(watchlists, latest)
+        if not users:
+            return 0
+        latest = dict(latest)
+        missing = {symbol for user_pk in users for symbol, _ in watchlists[user_pk] if symbol not in latest}
+        if missing:
+            try:
+                latest.update(batch_get_latest_market_data(missing))
+            except (ClientError, RuntimeError) as e:
+                logger.warning(f"최신 시세 조회 오류, 스냅샷 일부 종목 비움: {e}")
+        for user_pk in users:
+            writer.put(build_snapshot_item(user_pk, watchlists[user_pk], latest), tag=user_pk)
+        writer.flush()
+        with self._lock:
+            for user_pk in users:
+                holdings = watchlists[user_pk]
+                if writer.results.get(user_pk) == 'success':
+                    self._embedded[user_pk] = (tuple(holdings), {symbol: market_view_signature(latest.get(symbol)) for symbol, _ in holdings})
+                else:
+                    self._embedded.pop(user_pk, None)
+        return len(users)